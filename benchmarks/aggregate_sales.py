@@ -0,0 +1,80 @@
+"""Параллельная агрегация продаж: доля работы родительского процесса и
+время при разном числе процессов.
+
+Родительский процесс только готовит порции записей для пула: упаковывает
+чеки в памяти (pack_receipt) или копирует готовые записи чеков из архива.
+Разбор строк и суммирование выполняются в процессах пула.
+
+Запуск: python benchmarks/aggregate_sales.py [число чеков]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.aggregation import (  # noqa: E402
+    _aggregate_records,
+    _record_chunks,
+    aggregate_sales,
+)
+from task_package.archive import ReceiptArchive, append_receipts  # noqa: E402
+from task_package.zad2 import Goods, Receipt  # noqa: E402
+
+LINES_PER_RECEIPT = 100
+WORKER_COUNTS = (1, 2, 4)
+
+
+def make_receipts(count: int) -> list[Receipt]:
+    receipts = []
+    for number in range(count):
+        receipt = Receipt(number, LINES_PER_RECEIPT)
+        for i in range(LINES_PER_RECEIPT):
+            receipt.add_goods(Goods(f"{i},Товар{i % 50},{i / 10 + 0.5},{i % 7 + 1}"))
+        receipts.append(receipt)
+    return receipts
+
+
+def best(action: Callable[[], Any], repeats: int = 3) -> float:
+    result = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        result = min(result, time.perf_counter() - start)
+    return result
+
+
+def report(title: str, receipts: Any) -> None:
+    """Время подготовки порций в родителе и работы пула над ними"""
+    parent = best(
+        lambda: [pickle.dumps(chunk) for chunk in _record_chunks(receipts, 50_000)]
+    )
+    chunks = list(_record_chunks(receipts, 50_000))
+    pool = best(lambda: [_aggregate_records(chunk, "code") for chunk in chunks])
+    print(f"\n{title}:")
+    print(f"  родитель (упаковка и передача): {parent:8.3f} с")
+    print(f"  пул (разбор и суммирование):    {pool:8.3f} с")
+    print(f"  предел ускорения:               {(parent + pool) / parent:8.1f}x")
+    print(f"  {'Процессов':>10} {'время, с':>10}")
+    for workers in WORKER_COUNTS:
+        elapsed = best(lambda: aggregate_sales(receipts, workers=workers), repeats=1)
+        print(f"  {workers:>10} {elapsed:>10.3f}")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000
+    receipts = make_receipts(count)
+    print(f"Чеков: {count}, строк: {count * LINES_PER_RECEIPT}, ЦП: {os.cpu_count()}")
+    report("Чеки в памяти", receipts)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "receipts.bin")
+        append_receipts(path, receipts)
+        with ReceiptArchive(path) as archive:
+            report("Чеки из архива", archive)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Скорость пакетного разбора Goods.parse_batch против цикла Goods(строка).
+
+Запуск: python benchmarks/batch_parse.py [число строк]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad2 import Goods  # noqa: E402
+
+
+def best_of(repeats: int, function, *args) -> float:  # type: ignore[no-untyped-def]
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    lines = [f"{i},Товар{i % 50},{i % 1000 / 100},{i % 7}" for i in range(count)]
+    block = "\n".join(lines)
+
+    loop = best_of(3, lambda: [Goods(line) for line in lines])
+    columns = best_of(3, Goods.parse_batch, block)
+    objects = best_of(3, lambda: Goods.parse_batch(block).to_goods())
+
+    print(f"Строк: {count}")
+    print(f"{'Goods(строка) в цикле':<28} {count / loop:>12,.0f} строк/с")
+    print(
+        f"{'parse_batch -> столбцы':<28} {count / columns:>12,.0f} строк/с  x{loop / columns:.1f}"
+    )
+    print(
+        f"{'parse_batch -> Goods':<28} {count / objects:>12,.0f} строк/с  x{loop / objects:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Набор замеров скорости основных операций Goods и Receipt.
+
+Для каждого размера чека измеряются операции в секунду (лучший из
+нескольких повторов) и пиковая память (tracemalloc). Результаты можно
+сохранить в JSON и сравнить с сохранённой базой: операции, ставшие
+медленнее больше чем на порог, отмечаются как регрессии.
+
+Запуск:
+    python benchmarks/bench_receipt.py
+    python benchmarks/bench_receipt.py --sizes 10 100 1000 --save base.json
+    python benchmarks/bench_receipt.py --compare base.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad2 import Goods, Receipt  # noqa: E402
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+def make_lines(size: int) -> list[str]:
+    return [
+        f"{100 + i},Товар{i % 50},{i % 1000 / 100 + 0.5},{i % 9 + 1}"
+        for i in range(size)
+    ]
+
+
+def filled_receipt(lines: list[str]) -> Receipt:
+    receipt = Receipt(1, len(lines))
+    for line in lines:
+        receipt.add_goods(Goods(line))
+    return receipt
+
+
+def make_cases(size: int) -> dict[str, tuple[Callable[[], Any], Callable[[Any], None]]]:
+    """Операция -> (подготовка, замеряемое действие над подготовленным)"""
+    lines = make_lines(size)
+    codes = [100 + i for i in range(size)]
+
+    def add_goods(goods_list: Any) -> None:
+        receipt = Receipt(1, size)
+        for goods in goods_list:
+            receipt.add_goods(goods)
+
+    def find_goods(receipt: Any) -> None:
+        find = receipt.find_goods_by_code
+        for code in codes:
+            find(code)
+
+    def remove_goods(receipt: Any) -> None:
+        remove = receipt.remove_goods
+        for code in codes:
+            remove(code)
+
+    def total_sum(receipt: Any) -> None:
+        total = receipt.get_total_sum
+        for _ in range(size):
+            total()
+
+    def parse(_: Any) -> None:
+        for line in lines:
+            Goods(line)
+
+    def render(receipt: Any) -> None:
+        str(receipt)
+
+    return {
+        "add_goods": (lambda: [Goods(line) for line in lines], add_goods),
+        "find_goods_by_code": (lambda: filled_receipt(lines), find_goods),
+        "remove_goods": (lambda: filled_receipt(lines), remove_goods),
+        "get_total_sum": (lambda: filled_receipt(lines), total_sum),
+        "goods_parse": (lambda: None, parse),
+        "receipt_str": (lambda: filled_receipt(lines), render),
+    }
+
+
+def measure(
+    setup: Callable[[], Any],
+    action: Callable[[Any], None],
+    operations: int,
+    repeats: int,
+) -> tuple[float, int]:
+    """Лучшее число операций в секунду и пиковая память действия в байтах"""
+    best = float("inf")
+    for _ in range(repeats):
+        prepared = setup()
+        start = time.perf_counter()
+        action(prepared)
+        best = min(best, time.perf_counter() - start)
+    prepared = setup()
+    tracemalloc.start()
+    action(prepared)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return operations / best, peak
+
+
+def run(sizes: list[int], repeats: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        for name, (setup, action) in make_cases(size).items():
+            # __str__ строит один чек за вызов, остальные - size операций
+            operations = 1 if name == "receipt_str" else size
+            ops, peak = measure(setup, action, operations, repeats)
+            results[f"{name}[{size}]"] = {"ops_per_sec": ops, "peak_bytes": peak}
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Операции, ставшие медленнее базы больше чем на threshold"""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        change = current["ops_per_sec"] / base["ops_per_sec"] - 1
+        if change < -threshold:
+            regressions.append(f"{key}: {change:+.1%}")
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Замеры скорости Goods и Receipt")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="сохранить результаты в JSON")
+    parser.add_argument("--compare", help="сравнить с JSON-базой")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="допустимое замедление (доля)"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeats)
+    print(f"{'Операция':<28} {'операций/с':>14} {'пик памяти, КБ':>16}")
+    for key, value in results.items():
+        print(
+            f"{key:<28} {value['ops_per_sec']:>14,.0f} {value['peak_bytes'] / 1024:>16.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as stream:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                stream,
+                indent=2,
+            )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as stream:
+            baseline = json.load(stream)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nРегрессии:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nРегрессий нет")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
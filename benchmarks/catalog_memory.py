@@ -0,0 +1,80 @@
+"""Память на одну строку чека: товары Goods и строки каталога CatalogGoods.
+
+Строки раскладываются по чекам; в замер входят сами строки, их цены и
+регистрация чеков в каталоге, но не товары каталога.
+
+Запуск: python benchmarks/catalog_memory.py [количество строк]
+"""
+
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.catalog import Catalog  # noqa: E402
+from task_package.zad2 import Goods, Receipt  # noqa: E402
+
+NAMES = ["Яблоки", "Бананы", "Апельсины", "Груши", "Молоко", "Хлеб"]
+PRODUCTS = 1_000
+RECEIPT_SIZE = 50
+
+
+def make_catalog() -> Catalog:
+    catalog = Catalog()
+    for code in range(PRODUCTS):
+        catalog.add_product(code, NAMES[code % len(NAMES)], code % 97 + 0.5)
+    return catalog
+
+
+def goods_line(catalog: Catalog, i: int) -> Goods:
+    code = i % PRODUCTS
+    return Goods(
+        f"{code},{catalog.get_name(code)},{catalog.get_price(code)},{i % 13 + 1}"
+    )
+
+
+def catalog_line(catalog: Catalog, i: int) -> Any:
+    return catalog.line(i % PRODUCTS, i % 13 + 1)
+
+
+def measure(build: Callable[[], Any], count: int) -> float:
+    """Средний объём памяти в байтах на одну строку"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    receipts = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Внешний список чеков в измерение не входит
+    used -= sys.getsizeof(receipts)
+    return used / count
+
+
+def in_receipts(
+    factory: Callable[[Catalog, int], Any], catalog: Catalog, count: int
+) -> Callable[[], list[Receipt]]:
+    def build() -> list[Receipt]:
+        receipts = []
+        for start in range(0, count, RECEIPT_SIZE):
+            receipt = Receipt(start, RECEIPT_SIZE)
+            for i in range(start, min(start + RECEIPT_SIZE, count)):
+                receipt.add_goods(factory(catalog, i))
+            receipts.append(receipt)
+        return receipts
+
+    return build
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"Строк: {count}, строк в чеке: {RECEIPT_SIZE}, товаров: {PRODUCTS}")
+    goods = measure(in_receipts(goods_line, make_catalog(), count), count)
+    lines = measure(in_receipts(catalog_line, make_catalog(), count), count)
+    print(f"  Goods:         {goods:8.1f} байт/строка")
+    print(f"  CatalogGoods:  {lines:8.1f} байт/строка")
+    print(f"  Экономия:      {100 * (1 - lines / goods):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Пропускная способность ConcurrentReceipt в зависимости от числа потоков.
+
+Каждый поток добавляет строки со своими кодами, ищет и удаляет часть
+из них и читает итоги. Выводится число операций в секунду.
+
+Запуск: python benchmarks/concurrent_receipt.py [операций на поток]
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad2 import ConcurrentReceipt, Goods  # noqa: E402
+
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def worker(receipt: ConcurrentReceipt, base: int, operations: int) -> None:
+    goods = [Goods(f"{base + i},Товар,1.5,2") for i in range(operations)]
+    for item in goods:
+        receipt.add_goods(item)
+    for i in range(operations):
+        receipt.find_goods_by_code(base + i)
+    for i in range(0, operations, 2):
+        receipt.remove_goods(base + i)
+    for _ in range(operations):
+        receipt.snapshot()
+
+
+def run(threads_count: int, operations: int) -> float:
+    """Операций в секунду при заданном числе потоков"""
+    receipt = ConcurrentReceipt(1, size=threads_count * operations)
+    threads = [
+        threading.Thread(target=worker, args=(receipt, n * operations, operations))
+        for n in range(threads_count)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    # добавление, поиск, удаление половины, чтение итогов
+    total_operations = threads_count * (operations * 3 + operations // 2)
+    return total_operations / elapsed
+
+
+def main() -> None:
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'Потоков':>8} {'операций/с':>14}")
+    for threads_count in THREAD_COUNTS:
+        print(f"{threads_count:>8} {run(threads_count, operations):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Сравнение вещественного и целочисленного (копейки) расчёта итогов.
+
+Для каждого варианта заполняются чеки, затем итоги суммируются по
+всем чекам. Выводятся время и отклонение от точной суммы.
+
+Запуск: python benchmarks/fixed_point.py [число чеков]
+"""
+
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad2 import (  # noqa: E402
+    FixedPointGoods,
+    FixedPointReceipt,
+    Goods,
+    Receipt,
+)
+
+LINES_PER_RECEIPT = 20
+
+
+def make_lines(receipts_count: int) -> list[str]:
+    lines = []
+    for i in range(receipts_count * LINES_PER_RECEIPT):
+        cents = (i * 37) % 1000 + 10
+        lines.append(f"{i},Товар{i % 50},{cents // 100}.{cents % 100:02d},{i % 7 + 1}")
+    return lines
+
+
+def exact_total(lines: list[str]) -> Decimal:
+    total = Decimal(0)
+    for line in lines:
+        _, _, price, quantity = line.split(",")
+        total += Decimal(price) * int(quantity)
+    return total
+
+
+def run_float(lines: list[str]) -> tuple[float, float, Decimal]:
+    start = time.perf_counter()
+    receipts = []
+    for number in range(0, len(lines), LINES_PER_RECEIPT):
+        receipt = Receipt(number, LINES_PER_RECEIPT)
+        for line in lines[number : number + LINES_PER_RECEIPT]:
+            receipt.add_goods(Goods(line))
+        receipts.append(receipt)
+    built = time.perf_counter()
+    total = sum(receipt.get_total_sum() for receipt in receipts)
+    return built - start, time.perf_counter() - built, Decimal(repr(total))
+
+
+def run_fixed(lines: list[str]) -> tuple[float, float, Decimal]:
+    start = time.perf_counter()
+    receipts = []
+    for number in range(0, len(lines), LINES_PER_RECEIPT):
+        receipt = FixedPointReceipt(number, LINES_PER_RECEIPT)
+        for line in lines[number : number + LINES_PER_RECEIPT]:
+            receipt.add_goods(FixedPointGoods(line))
+        receipts.append(receipt)
+    built = time.perf_counter()
+    total_cents = FixedPointReceipt.sum_cents(receipts)
+    return built - start, time.perf_counter() - built, Decimal(total_cents) / 100
+
+
+def main() -> None:
+    receipts_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    lines = make_lines(receipts_count)
+    exact = exact_total(lines)
+    print(f"Чеков: {receipts_count}, строк: {len(lines)}, точная сумма: {exact}")
+    print(f"{'Вариант':<10} {'заполнение, с':>14} {'сумма, с':>10} {'отклонение':>14}")
+    for title, run in (("float", run_float), ("копейки", run_fixed)):
+        build_time, sum_time, total = run(lines)
+        error = abs(total - exact)
+        print(f"{title:<10} {build_time:>14.3f} {sum_time:>10.4f} {error:>14.2E}")
+
+
+if __name__ == "__main__":
+    main()
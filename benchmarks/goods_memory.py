@@ -0,0 +1,103 @@
+"""Сравнение памяти на один товар: компактный Goods и размещение с __dict__.
+
+Замеряются отдельные товары и товары, лежащие в чеках ("день продаж"):
+во втором случае учитывается и регистрация чека-владельца у товара.
+
+Запуск: python benchmarks/goods_memory.py [количество]
+"""
+
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad2 import Goods, Receipt  # noqa: E402
+
+NAMES = ["Яблоки", "Бананы", "Апельсины", "Груши", "Молоко", "Хлеб"]
+RECEIPT_SIZE = 50
+
+
+class DictGoods:
+    """Прежнее размещение товара: поля в __dict__, наименования не
+    разделяются, чеки-владельцы хранятся обычным списком"""
+
+    def __init__(self, line: str) -> None:
+        code_str, name, price_str, quantity_str = line.split(",")
+        self._code = int(code_str)
+        self._name = name
+        self._price = float(price_str)
+        self._quantity = int(quantity_str)
+        self._owners: Any = None
+
+    def get_code(self) -> int:
+        return self._code
+
+    def get_quantity(self) -> int:
+        return self._quantity
+
+    def get_total(self) -> float:
+        return self._price * self._quantity
+
+    def _attach(self, receipt: Receipt) -> None:
+        if self._owners is None:
+            self._owners = []
+        self._owners.append(receipt)
+
+
+def make_lines(count: int) -> list[str]:
+    return [
+        f"{i},{NAMES[i % len(NAMES)]},{i % 97 + 0.5},{i % 13}" for i in range(count)
+    ]
+
+
+def measure(build: Callable[[], Any], count: int) -> float:
+    """Средний объём памяти в байтах на один товар"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Внешний список ссылок в измерение не входит
+    used -= sys.getsizeof(objects)
+    return used / count
+
+
+def loose(factory: Callable[[str], Any], lines: list[str]) -> Callable[[], Any]:
+    return lambda: [factory(line) for line in lines]
+
+
+def in_receipts(factory: Callable[[str], Any], lines: list[str]) -> Callable[[], Any]:
+    """Товары, разложенные по чекам по RECEIPT_SIZE строк"""
+
+    def build() -> list[Receipt]:
+        receipts = []
+        for start in range(0, len(lines), RECEIPT_SIZE):
+            receipt = Receipt(start, RECEIPT_SIZE)
+            for line in lines[start : start + RECEIPT_SIZE]:
+                receipt.add_goods(factory(line))
+            receipts.append(receipt)
+        return receipts
+
+    return build
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lines = make_lines(count)
+    print(f"Товаров: {count}, строк в чеке: {RECEIPT_SIZE}")
+    for title, scenario in (
+        ("Отдельные товары", loose),
+        ("Товары в чеках", in_receipts),
+    ):
+        legacy = measure(scenario(DictGoods, lines), count)
+        compact = measure(scenario(Goods, lines), count)
+        print(f"\n{title}:")
+        print(f"  С __dict__:  {legacy:8.1f} байт/товар")
+        print(f"  __slots__:   {compact:8.1f} байт/товар")
+        print(f"  Экономия:    {100 * (1 - compact / legacy):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
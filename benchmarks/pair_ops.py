@@ -0,0 +1,111 @@
+"""Сравнение Pair до и после: размещение с __dict__ и проверкой float()
+в каждой операции против __slots__ и создания результатов без проверки.
+
+Выводятся операции в секунду для + - * / и память на один объект.
+
+Запуск: python benchmarks/pair_ops.py [количество]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from task_package.zad1 import Pair  # noqa: E402
+
+
+class DictPair:
+    """Прежнее размещение точки: поля в __dict__, результат операций
+    создаётся через __init__ с преобразованием float()"""
+
+    def __init__(self, first: float = 0.0, second: float = 0.0) -> None:
+        try:
+            self.first = float(first)
+            self.second = float(second)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Введите дробное число Float") from e
+
+    def __add__(self, other: "DictPair") -> "DictPair":
+        if not isinstance(other, DictPair):
+            raise TypeError("Можно складывать только объекты Pair")
+        return DictPair(self.first + other.first, self.second + other.second)
+
+    def __sub__(self, other: "DictPair") -> "DictPair":
+        if not isinstance(other, DictPair):
+            raise TypeError("Можно вычитать только объекты Pair")
+        return DictPair(self.first - other.first, self.second - other.second)
+
+    def __mul__(self, scalar: float) -> "DictPair":
+        try:
+            scalar_float = float(scalar)
+        except (ValueError, TypeError):
+            raise TypeError("Можно умножать только на число")
+        return DictPair(self.first * scalar_float, self.second * scalar_float)
+
+    def __truediv__(self, scalar: float) -> "DictPair":
+        try:
+            scalar_float = float(scalar)
+        except (ValueError, TypeError):
+            raise TypeError("Можно делить только на число")
+        if scalar_float == 0:
+            raise ZeroDivisionError("Деление на ноль")
+        return DictPair(self.first / scalar_float, self.second / scalar_float)
+
+
+OPERATIONS: dict[str, Callable[[Any, Any], Any]] = {
+    "+": lambda p, q: p + q,
+    "-": lambda p, q: p - q,
+    "*": lambda p, q: p * 1.5,
+    "/": lambda p, q: p / 1.5,
+}
+
+
+def ops_per_sec(cls: type, operation: Callable[[Any, Any], Any], count: int) -> float:
+    """Лучшее из трёх число операций в секунду"""
+    points = [cls(i, i * 0.5) for i in range(count)]
+    other = cls(1.0, 2.0)
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for point in points:
+            operation(point, other)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def bytes_per_instance(cls: type, count: int) -> float:
+    """Средний объём памяти в байтах на один созданный объект"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls(i, i * 0.5) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Список ссылок на объекты в измерение не входит
+    used -= sys.getsizeof(objects)
+    return used / count
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Точек: {count}")
+    print(
+        f"{'Операция':<10} {'__dict__, оп/с':>16} {'__slots__, оп/с':>16} {'ускорение':>10}"
+    )
+    for name, operation in OPERATIONS.items():
+        legacy = ops_per_sec(DictPair, operation, count)
+        current = ops_per_sec(Pair, operation, count)
+        print(
+            f"{name:<10} {legacy:>16,.0f} {current:>16,.0f} {current / legacy:>9.2f}x"
+        )
+    legacy_bytes = bytes_per_instance(DictPair, count)
+    current_bytes = bytes_per_instance(Pair, count)
+    print(f"\nС __dict__:  {legacy_bytes:8.1f} байт/точка")
+    print(f"__slots__:   {current_bytes:8.1f} байт/точка")
+    print(f"Экономия:    {100 * (1 - current_bytes / legacy_bytes):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
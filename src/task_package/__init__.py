@@ -1,4 +1,67 @@
-from .zad1 import Pair
-from .zad2 import Goods, Receipt
+from .aggregation import SalesTotal, aggregate_sales
+from .archive import ReceiptArchive, append_receipts, pack_receipt
+from .catalog import Catalog, CatalogGoods
+from .coords import (
+    MappedCoordinates,
+    load_binary,
+    load_pair_array,
+    read_pairs,
+    write_binary,
+)
+from .ingest import IngestRejection, LineItem, ReceiptIngestor
+from .render import ReceiptRenderer
+from .spatial import KDTree, SpatialHash
+from .store import ReceiptStore
+from .zad1 import Pair, PairArray
+from .zad2 import (
+    BaseGoods,
+    ColumnarReceipt,
+    ConcurrentReceipt,
+    FixedPointGoods,
+    FixedPointReceipt,
+    Goods,
+    GoodsColumns,
+    GoodsParseError,
+    Receipt,
+    ReceiptDiff,
+    ReceiptMetrics,
+    SortedReceipt,
+    to_minor_units,
+)
 
-__all__ = ["Pair", "Goods", "Receipt"]
+__all__ = [
+    "Pair",
+    "PairArray",
+    "KDTree",
+    "SpatialHash",
+    "read_pairs",
+    "load_pair_array",
+    "load_binary",
+    "write_binary",
+    "MappedCoordinates",
+    "BaseGoods",
+    "Goods",
+    "GoodsParseError",
+    "GoodsColumns",
+    "Receipt",
+    "ReceiptDiff",
+    "ReceiptMetrics",
+    "ColumnarReceipt",
+    "ConcurrentReceipt",
+    "FixedPointGoods",
+    "FixedPointReceipt",
+    "SortedReceipt",
+    "to_minor_units",
+    "ReceiptRenderer",
+    "ReceiptArchive",
+    "append_receipts",
+    "pack_receipt",
+    "ReceiptStore",
+    "SalesTotal",
+    "aggregate_sales",
+    "LineItem",
+    "IngestRejection",
+    "ReceiptIngestor",
+    "Catalog",
+    "CatalogGoods",
+]
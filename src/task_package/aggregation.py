@@ -0,0 +1,193 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+from typing import Hashable, Iterable, Iterator, NamedTuple, Optional, Protocol
+
+from .archive import ArchivedReceipt, pack_receipt
+from .zad2 import BaseGoods
+
+
+class _SalesReceipt(Protocol):
+    def __iter__(self) -> Iterator[BaseGoods]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def get_receipt_number(self) -> int:
+        ...
+
+    def get_date_time(self) -> datetime:
+        ...
+
+    def size(self) -> int:
+        ...
+
+
+class SalesTotal(NamedTuple):
+    """Итог продаж по группе: выручка, проданные единицы, число строк"""
+
+    revenue: float
+    units: int
+    lines: int
+
+
+# Промежуточный итог группы: точное разложение выручки в сумму чисел float,
+# количество единиц и число строк
+_Partial = tuple[list[float], int, int]
+_Row = tuple[Hashable, float, int]
+
+GROUP_KEYS = ("code", "name", "hour")
+
+
+def _exact_expansion(values: list[float]) -> list[float]:
+    """Разложение точной суммы значений в несколько чисел float.
+
+    Каждое следующее слагаемое - округлённый остаток после предыдущих,
+    поэтому сумма разложения равна точной сумме значений. Это позволяет
+    объединять частичные итоги в любом порядке с одинаковым результатом."""
+    expansion: list[float] = []
+    terms = list(values)
+    for _ in range(64):
+        part = math.fsum(terms)
+        expansion.append(part)
+        if part == 0.0 or not math.isfinite(part):
+            break
+        terms.append(-part)
+    return expansion
+
+
+def _key(goods: BaseGoods, date_time: datetime, group_by: str) -> Hashable:
+    if group_by == "code":
+        return goods.get_code()
+    if group_by == "name":
+        return goods.get_name()
+    return date_time.hour
+
+
+def _archived_rows(archived: ArchivedReceipt, group_by: str) -> Iterator[_Row]:
+    """Строки чека из архива без создания объектов Goods"""
+    if group_by == "code":
+        yield from archived.iter_lines()
+    elif group_by == "name":
+        for _, name, price, quantity in archived.iter_named_lines():
+            yield name, price, quantity
+    else:
+        hour = archived.get_date_time().hour
+        for _, price, quantity in archived.iter_lines():
+            yield hour, price, quantity
+
+
+def _rows(receipts: Iterable[_SalesReceipt], group_by: str) -> Iterator[_Row]:
+    for receipt in receipts:
+        if isinstance(receipt, ArchivedReceipt):
+            yield from _archived_rows(receipt, group_by)
+            continue
+        date_time = receipt.get_date_time()
+        for goods in receipt:
+            key = _key(goods, date_time, group_by)
+            yield key, goods.get_price(), goods.get_quantity()
+
+
+def _aggregate_rows(rows: Iterable[_Row]) -> dict[Hashable, _Partial]:
+    """Частичная агрегация строк (ключ, цена, количество)"""
+    products: dict[Hashable, list[float]] = {}
+    units: dict[Hashable, int] = {}
+    lines: dict[Hashable, int] = {}
+    for key, price, quantity in rows:
+        group = products.get(key)
+        if group is None:
+            products[key] = [price * quantity]
+            units[key] = quantity
+            lines[key] = 1
+        else:
+            group.append(price * quantity)
+            units[key] += quantity
+            lines[key] += 1
+    return {
+        key: (_exact_expansion(group), units[key], lines[key])
+        for key, group in products.items()
+    }
+
+
+def _record_rows(records: list[bytes], group_by: str) -> Iterator[_Row]:
+    """Строки чеков из двоичных записей архива"""
+    for record in records:
+        yield from _archived_rows(ArchivedReceipt(record, 0), group_by)
+
+
+def _aggregate_records(records: list[bytes], group_by: str) -> dict[Hashable, _Partial]:
+    """Разбор записей и частичная агрегация (выполняется в процессе пула)"""
+    return _aggregate_rows(_record_rows(records, group_by))
+
+
+def _record_chunks(
+    receipts: Iterable[_SalesReceipt], chunk_size: int
+) -> Iterator[list[bytes]]:
+    """Порции записей чеков примерно по chunk_size строк. Чеки из архива
+    передаются готовыми записями, остальные упаковываются pack_receipt"""
+    chunk: list[bytes] = []
+    lines = 0
+    for receipt in receipts:
+        if isinstance(receipt, ArchivedReceipt):
+            chunk.append(receipt.to_bytes())
+        else:
+            chunk.append(pack_receipt(receipt))
+        lines += len(receipt)
+        if lines >= chunk_size:
+            yield chunk
+            chunk = []
+            lines = 0
+    if chunk:
+        yield chunk
+
+
+def _merge(result: dict[Hashable, _Partial], partial: dict[Hashable, _Partial]) -> None:
+    for key, (expansion, units, lines) in partial.items():
+        current = result.get(key)
+        if current is None:
+            result[key] = (list(expansion), units, lines)
+        else:
+            current[0].extend(expansion)
+            result[key] = (current[0], current[1] + units, current[2] + lines)
+
+
+def aggregate_sales(
+    receipts: Iterable[_SalesReceipt],
+    group_by: str = "code",
+    workers: Optional[int] = None,
+    chunk_size: int = 50_000,
+) -> dict[Hashable, SalesTotal]:
+    """Выручка и проданные единицы по группам: "code", "name" или "hour".
+
+    При workers > 1 чеки передаются пулу процессов порциями примерно по
+    chunk_size строк в виде двоичных записей архива (см. archive.py);
+    процессы разбирают их и агрегируют, частичные итоги объединяются.
+    Выручка суммируется точно, поэтому результат совпадает с
+    последовательным расчётом (workers = None или 1) до последнего бита."""
+    if group_by not in GROUP_KEYS:
+        raise ValueError(f"Группировка возможна только по {GROUP_KEYS}")
+    result: dict[Hashable, _Partial] = {}
+    if workers is None or workers <= 1:
+        rows = _rows(receipts, group_by)
+        for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+            _merge(result, _aggregate_rows(chunk))
+    else:
+        # Родительский процесс только упаковывает чеки; разбор строк,
+        # вычисление ключей и суммирование выполняются в процессах пула
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: set[Future[dict[Hashable, _Partial]]] = set()
+            for records in _record_chunks(receipts, chunk_size):
+                pending.add(executor.submit(_aggregate_records, records, group_by))
+                # Не более двух порций на процесс в очереди
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(result, future.result())
+            for future in pending:
+                _merge(result, future.result())
+    return {
+        key: SalesTotal(math.fsum(expansion), units, lines)
+        for key, (expansion, units, lines) in result.items()
+    }
@@ -0,0 +1,292 @@
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import BinaryIO, Iterable, Iterator, Optional, Protocol, Union
+
+from .zad2 import BaseGoods, Goods, Receipt
+
+# Формат архива чеков (little-endian):
+#   заголовок файла: MAGIC, версия (u32)
+#   запись чека:     длина записи (u32), номер (i64), время в мкс от 1970-01-01 (i64),
+#                    размер чека (u32), число строк (u32), число наименований (u32)
+#   строки:          код (i64), цена (f64), количество (i64), номер наименования (u32)
+#   наименования:    длина в байтах (u32), UTF-8
+MAGIC = b"RCPA"
+VERSION = 1
+
+_FILE_HEADER = struct.Struct("<4sI")
+_RECEIPT = struct.Struct("<IqqIII")
+_LINE = struct.Struct("<qdqI")
+_NAME = struct.Struct("<I")
+_RECORD_LENGTH = struct.Struct("<I")
+_RECORD_NUMBER = struct.Struct("<q")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class _PackableReceipt(Protocol):
+    """Чек, который можно упаковать в запись архива"""
+
+    def __iter__(self) -> Iterator[BaseGoods]:
+        ...
+
+    def get_receipt_number(self) -> int:
+        ...
+
+    def get_date_time(self) -> datetime:
+        ...
+
+    def size(self) -> int:
+        ...
+
+
+def to_timestamp(date_time: datetime) -> int:
+    """Время чека в микросекундах от 1970-01-01, как оно хранится в архиве"""
+    return (date_time - _EPOCH) // _MICROSECOND
+
+
+def pack_receipt(receipt: _PackableReceipt) -> bytes:
+    """Упаковка чека в двоичную запись архива"""
+    name_ids: dict[str, int] = {}
+    lines = []
+    for goods in receipt:
+        name = goods.get_name()
+        name_id = name_ids.setdefault(name, len(name_ids))
+        lines.append(
+            _LINE.pack(
+                goods.get_code(), goods.get_price(), goods.get_quantity(), name_id
+            )
+        )
+    names = []
+    for name in name_ids:
+        encoded = name.encode("utf-8")
+        names.append(_NAME.pack(len(encoded)))
+        names.append(encoded)
+    body = b"".join(lines) + b"".join(names)
+    header = _RECEIPT.pack(
+        _RECEIPT.size + len(body),
+        receipt.get_receipt_number(),
+        to_timestamp(receipt.get_date_time()),
+        receipt.size(),
+        len(lines),
+        len(name_ids),
+    )
+    return header + body
+
+
+def write_receipts(stream: BinaryIO, receipts: Iterable[Receipt]) -> int:
+    """Запись чеков в поток (после заголовка файла). Возвращает число байт"""
+    written = 0
+    for receipt in receipts:
+        written += stream.write(pack_receipt(receipt))
+    return written
+
+
+def write_header(stream: BinaryIO) -> int:
+    """Запись заголовка файла архива"""
+    return stream.write(_FILE_HEADER.pack(MAGIC, VERSION))
+
+
+def append_receipts(
+    path: Union[str, os.PathLike[str]], receipts: Iterable[Receipt]
+) -> int:
+    """Дозапись чеков в файл архива, создаёт файл с заголовком при отсутствии.
+    Возвращает смещение первой дописанной записи"""
+    with open(path, "ab") as stream:
+        if stream.tell() == 0:
+            write_header(stream)
+        offset = stream.tell()
+        write_receipts(stream, receipts)
+    return offset
+
+
+class ArchivedReceipt:
+    """Чек в отображённом в память архиве.
+
+    Поля читаются из общего буфера по требованию, без копирования записи."""
+
+    def __init__(self, buffer: Union[mmap.mmap, bytes], offset: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        (
+            self._length,
+            self._receipt_number,
+            self._timestamp,
+            self._size,
+            self._count,
+            self._name_count,
+        ) = _RECEIPT.unpack_from(buffer, offset)
+        self._lines_offset = offset + _RECEIPT.size
+        self._names: Optional[list[str]] = None
+
+    def get_receipt_number(self) -> int:
+        return self._receipt_number
+
+    def get_date_time(self) -> datetime:
+        return _EPOCH + self._timestamp * _MICROSECOND
+
+    def get_timestamp(self) -> int:
+        return self._timestamp
+
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _name_table(self) -> list[str]:
+        if self._names is None:
+            names = []
+            position = self._lines_offset + self._count * _LINE.size
+            for _ in range(self._name_count):
+                (length,) = _NAME.unpack_from(self._buffer, position)
+                position += _NAME.size
+                names.append(str(self._buffer[position : position + length], "utf-8"))
+                position += length
+            self._names = names
+        return self._names
+
+    def to_bytes(self) -> bytes:
+        """Копия двоичной записи чека"""
+        return bytes(self._buffer[self._offset : self._offset + self._length])
+
+    def iter_named_lines(self) -> Iterator[tuple[int, str, float, int]]:
+        """Обход строк как кортежей (код, наименование, цена, количество)"""
+        names = self._name_table()
+        unpack_from = _LINE.unpack_from
+        buffer = self._buffer
+        for position in range(
+            self._lines_offset,
+            self._lines_offset + self._count * _LINE.size,
+            _LINE.size,
+        ):
+            code, price, quantity, name_id = unpack_from(buffer, position)
+            yield code, names[name_id], price, quantity
+
+    def iter_lines(self) -> Iterator[tuple[int, float, int]]:
+        """Обход строк как кортежей (код, цена, количество) без создания Goods"""
+        unpack_from = _LINE.unpack_from
+        buffer = self._buffer
+        for position in range(
+            self._lines_offset,
+            self._lines_offset + self._count * _LINE.size,
+            _LINE.size,
+        ):
+            code, price, quantity, _ = unpack_from(buffer, position)
+            yield code, price, quantity
+
+    def get_total_sum(self) -> float:
+        total = 0.0
+        for _, price, quantity in self.iter_lines():
+            total += price * quantity
+        return total
+
+    def __getitem__(self, index: int) -> Goods:
+        if index < 0 or index >= self._count:
+            raise IndexError(f"Index {index} out of range [0, {self._count-1}]")
+        code, price, quantity, name_id = _LINE.unpack_from(
+            self._buffer, self._lines_offset + index * _LINE.size
+        )
+        goods = Goods()
+        goods.set_code(code)
+        goods.set_name(self._name_table()[name_id])
+        goods.set_price(price)
+        goods.set_quantity(quantity)
+        return goods
+
+    def __iter__(self) -> Iterator[Goods]:
+        for index in range(self._count):
+            yield self[index]
+
+    def to_receipt(self) -> Receipt:
+        """Восстановление полноценного объекта Receipt"""
+        receipt = Receipt(self._receipt_number, self._size)
+        receipt._date_time = self.get_date_time()
+        for goods in self:
+            receipt.add_goods(goods)
+        return receipt
+
+
+class ReceiptArchive:
+    """Чтение архива чеков через отображение файла в память.
+
+    Индекс "номер чека -> смещение" строится обходом заголовков записей
+    без чтения строк товаров."""
+
+    def __init__(self, path: Union[str, os.PathLike[str]]) -> None:
+        with open(path, "rb") as stream:
+            self._buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _FILE_HEADER.size:
+            self._buffer.close()
+            raise ValueError("Неверный формат архива чеков")
+        magic, version = _FILE_HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self._buffer.close()
+            raise ValueError("Неверный формат архива чеков")
+        self._offsets: Optional[dict[int, int]] = None
+
+    def __enter__(self) -> "ReceiptArchive":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def offsets(self) -> Iterator[int]:
+        """Смещения записей чеков по порядку"""
+        position = _FILE_HEADER.size
+        end = len(self._buffer)
+        while position < end:
+            if position + _RECEIPT.size > end:
+                raise ValueError(f"Обрезанная запись чека по смещению {position}")
+            (length,) = _RECORD_LENGTH.unpack_from(self._buffer, position)
+            if length < _RECEIPT.size or position + length > end:
+                raise ValueError(
+                    f"Неверная длина записи чека {length} по смещению {position}"
+                )
+            yield position
+            position += length
+
+    def complete_end(self) -> int:
+        """Конец последней целой записи; меньше размера файла, если
+        последняя запись оборвана (например, сбоем во время дозаписи)"""
+        position = _FILE_HEADER.size
+        end = len(self._buffer)
+        while position + _RECEIPT.size <= end:
+            (length,) = _RECORD_LENGTH.unpack_from(self._buffer, position)
+            if length < _RECEIPT.size or position + length > end:
+                break
+            position += length
+        return position
+
+    def receipt_at(self, offset: int) -> ArchivedReceipt:
+        return ArchivedReceipt(self._buffer, offset)
+
+    def __iter__(self) -> Iterator[ArchivedReceipt]:
+        for offset in self.offsets():
+            yield ArchivedReceipt(self._buffer, offset)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.offsets())
+
+    def _index(self) -> dict[int, int]:
+        if self._offsets is None:
+            offsets: dict[int, int] = {}
+            for offset in self.offsets():
+                (receipt_number,) = _RECORD_NUMBER.unpack_from(
+                    self._buffer, offset + _RECORD_LENGTH.size
+                )
+                offsets.setdefault(receipt_number, offset)
+            self._offsets = offsets
+        return self._offsets
+
+    def get(self, receipt_number: int) -> Optional[ArchivedReceipt]:
+        """Поиск чека по номеру"""
+        offset = self._index().get(receipt_number)
+        if offset is None:
+            return None
+        return ArchivedReceipt(self._buffer, offset)
@@ -0,0 +1,209 @@
+import weakref
+from typing import Iterable, Optional
+
+from .zad2 import BaseGoods, Receipt
+
+# Минимальное число ссылок на чеки, после которого проводится чистка
+_SWEEP_MIN = 1024
+
+
+class Catalog:
+    """Общий каталог товаров: код -> (наименование, цена).
+
+    Строки чеков CatalogGoods хранят только код, количество и, при
+    необходимости, собственную цену, а наименование и цену берут из
+    каталога. Изменение цены в каталоге сразу действует во всех чеках;
+    итоги пересчитываются только у чеков, содержащих строки с этим кодом."""
+
+    def __init__(self) -> None:
+        self._products: dict[int, tuple[str, float]] = {}
+        # Один объект кода на товар: строки хранят его, а не свои копии
+        self._codes: dict[int, int] = {}
+        # Чеки со строками товара: код -> слабые ссылки на чеки. Ссылки без
+        # обработчика общие для всех строк чека, так что на пару (товар, чек)
+        # приходится один указатель в списке
+        self._receipts: dict[int, list[weakref.ref[Receipt]]] = {}
+        self._registered = 0
+        self._sweep_at = _SWEEP_MIN
+
+    @classmethod
+    def from_goods(cls, goods_list: Iterable[BaseGoods]) -> "Catalog":
+        """Каталог по набору товаров (последний товар с кодом побеждает)"""
+        catalog = cls()
+        for goods in goods_list:
+            catalog.add_product(goods.get_code(), goods.get_name(), goods.get_price())
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._products
+
+    def add_product(self, code: int, name: str, price: float) -> None:
+        """Добавление товара в каталог или замена его наименования и цены"""
+        old = self._products.get(code)
+        self._products[code] = (name, price)
+        self._codes.setdefault(code, code)
+        if old is not None and old[1] != price:
+            self._notify(code, old[1])
+
+    def get_name(self, code: int) -> str:
+        return self._product(code)[0]
+
+    def get_price(self, code: int) -> float:
+        return self._product(code)[1]
+
+    def set_price(self, code: int, price: float) -> None:
+        """Изменение цены товара во всём каталоге"""
+        name, old_price = self._product(code)
+        self._products[code] = (name, price)
+        self._notify(code, old_price)
+
+    def line(
+        self, code: int, quantity: int, price: Optional[float] = None
+    ) -> "CatalogGoods":
+        """Строка чека для товара каталога"""
+        return CatalogGoods(self, code, quantity, price)
+
+    def _code(self, code: int) -> int:
+        """Общий объект кода товара каталога"""
+        self._product(code)
+        return self._codes[code]
+
+    def _product(self, code: int) -> tuple[str, float]:
+        try:
+            return self._products[code]
+        except KeyError:
+            raise KeyError(f"Товар с кодом {code} отсутствует в каталоге") from None
+
+    def _notify(self, code: int, old_price: float) -> None:
+        """Пересчёт итогов чеков со строками товара без собственной цены"""
+        for receipt in self._receipts_with_code(code):
+            for line in receipt._goods_with_code(code):
+                if (
+                    isinstance(line, CatalogGoods)
+                    and line._catalog is self
+                    and line._price_override is None
+                ):
+                    receipt._on_amount_changed(line, old_price, line._quantity)
+
+    def _receipts_with_code(self, code: int) -> list[Receipt]:
+        """Живые чеки со строками товара; устаревшие ссылки удаляются"""
+        refs = self._receipts.get(code)
+        if refs is None:
+            return []
+        receipts = []
+        kept = []
+        seen: set[int] = set()
+        for ref in refs:
+            receipt = ref()
+            if (
+                receipt is not None
+                and id(receipt) not in seen
+                and receipt._has_code(code)
+            ):
+                seen.add(id(receipt))
+                receipts.append(receipt)
+                kept.append(ref)
+        self._registered -= len(refs) - len(kept)
+        if kept:
+            self._receipts[code] = kept
+        else:
+            del self._receipts[code]
+        return receipts
+
+    def _register(self, code: int, receipt: Receipt) -> None:
+        """Учёт строки товара, которая ещё не внесена в индекс чека.
+
+        Чек заносится в список товара, только если в нём ещё нет записей
+        с этим кодом; при удалении строк ссылка остаётся и вычищается
+        позже, при пересчёте цены или очередной чистке."""
+        if receipt._has_code(code):
+            return
+        self._receipts.setdefault(code, []).append(weakref.ref(receipt))
+        self._registered += 1
+        if self._registered >= self._sweep_at:
+            for known in list(self._receipts):
+                self._receipts_with_code(known)
+            self._sweep_at = max(_SWEEP_MIN, 2 * self._registered)
+
+
+class CatalogGoods(BaseGoods):
+    """Строка чека, ссылающаяся на товар каталога по коду.
+
+    Хранит код, количество и необязательную собственную цену; наименование
+    и цена по умолчанию читаются из каталога. Слотов для наименования и
+    цены у строки нет."""
+
+    __slots__ = ("_catalog", "_price_override")
+
+    def __init__(
+        self, catalog: Catalog, code: int, quantity: int, price: Optional[float] = None
+    ) -> None:
+        self._catalog = catalog
+        self._code = catalog._code(code)
+        self._quantity = quantity
+        self._price_override = price
+        self._owners = None
+
+    @property
+    def _name(self) -> str:
+        return self._catalog.get_name(self._code)
+
+    @_name.setter
+    def _name(self, value: str) -> None:
+        raise TypeError("Наименование строки задаётся в каталоге")
+
+    @property
+    def _price(self) -> float:
+        if self._price_override is not None:
+            return self._price_override
+        return self._catalog.get_price(self._code)
+
+    @_price.setter
+    def _price(self, value: float) -> None:
+        self._price_override = value
+
+    def copy(self) -> "CatalogGoods":
+        """Независимая строка того же товара каталога"""
+        return CatalogGoods(
+            self._catalog, self._code, self._quantity, self._price_override
+        )
+
+    def get_price_override(self) -> Optional[float]:
+        return self._price_override
+
+    def set_price(self, price: float) -> None:
+        """Собственная цена строки вместо цены каталога"""
+        old_price = self._price
+        self._price_override = price
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_amount_changed(self, old_price, self._quantity)
+
+    def reset_price(self) -> None:
+        """Отказ от собственной цены в пользу цены каталога"""
+        old_price = self._price
+        self._price_override = None
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_amount_changed(self, old_price, self._quantity)
+
+    def set_name(self, name: str) -> None:
+        raise TypeError("Наименование строки задаётся в каталоге")
+
+    def set_code(self, code: int) -> None:
+        code = self._catalog._code(code)
+        old_price = self._price
+        if self._owners is not None:
+            for owner in self._receipts():
+                self._catalog._register(code, owner)
+        super().set_code(code)
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_amount_changed(self, old_price, self._quantity)
+
+    def _attach(self, receipt: Receipt) -> None:
+        super()._attach(receipt)
+        self._catalog._register(self._code, receipt)
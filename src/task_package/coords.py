@@ -0,0 +1,192 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain, repeat
+from typing import IO, Iterable, Iterator, Optional, Union
+
+from .zad1 import Pair, PairArray, _pair
+
+# Двоичный файл координат: подряд пары x, y (f64, little-endian) без заголовка
+_POINT = struct.Struct("<dd")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+# Точек в порции при обходе MappedCoordinates
+_ITER_CHUNK = 4096
+
+Source = Union[str, os.PathLike[str], IO[str], Iterable[str]]
+Path = Union[str, os.PathLike[str]]
+
+
+def _lines(source: Source) -> Iterator[str]:
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as stream:
+            yield from stream
+    else:
+        yield from source
+
+
+def _coordinates(
+    source: Source, delimiter: Optional[str]
+) -> Iterator[tuple[float, float]]:
+    """Координаты строк "x,y" или "x y"; пустые строки и строки,
+    начинающиеся с #, пропускаются"""
+    for number, line in enumerate(_lines(source), 1):
+        if delimiter is None:
+            fields = line.replace(",", " ").split()
+        else:
+            fields = line.strip().split(delimiter)
+        if not fields or fields == [""] or fields[0].startswith("#"):
+            continue
+        try:
+            x, y = fields
+            yield float(x), float(y)
+        except ValueError as e:
+            raise ValueError(
+                f"Строка {number}: ожидались две координаты: {line.strip()!r}"
+            ) from e
+
+
+def read_pairs(source: Source, delimiter: Optional[str] = None) -> Iterator[Pair]:
+    """Ленивое чтение точек из текста: путь к файлу, открытый поток или
+    набор строк (строка str считается путём).
+
+    По умолчанию координаты разделяются запятой и/или пробелами."""
+    for x, y in _coordinates(source, delimiter):
+        yield _pair(x, y)
+
+
+def load_pair_array(source: Source, delimiter: Optional[str] = None) -> PairArray:
+    """Чтение точек из текста сразу в столбцы PairArray без объектов Pair"""
+    result = PairArray()
+    append_x, append_y = result.first.append, result.second.append
+    for x, y in _coordinates(source, delimiter):
+        append_x(x)
+        append_y(y)
+    return result
+
+
+def write_binary(path: Path, points: Union[PairArray, Iterable[Pair]]) -> None:
+    """Запись точек в двоичный файл координат"""
+    if not isinstance(points, PairArray):
+        points = PairArray.from_pairs(points)
+    data = array("d", bytes(8 * 2 * len(points)))
+    data[0::2] = points.first
+    data[1::2] = points.second
+    if not _LITTLE_ENDIAN:
+        data.byteswap()
+    with open(path, "wb") as stream:
+        data.tofile(stream)
+
+
+def load_binary(path: Path) -> PairArray:
+    """Чтение двоичного файла координат целиком в столбцы PairArray"""
+    data = array("d")
+    with open(path, "rb") as stream:
+        raw = stream.read()
+    if len(raw) % _POINT.size:
+        raise ValueError("Размер файла координат не кратен 16 байтам")
+    data.frombytes(raw)
+    if not _LITTLE_ENDIAN:
+        data.byteswap()
+    return PairArray(data[0::2], data[1::2])
+
+
+def _chunk_pairs(view: "memoryview[float]", start: int) -> Iterator[Pair]:
+    """Точки порции представления, начиная с координаты start.
+
+    Срез живёт только на время копирования порции, поэтому незаконченный
+    обход не мешает закрытию файла"""
+    with view[start : start + 2 * _ITER_CHUNK] as part:
+        values = part.tolist()
+    return map(_pair, values[0::2], values[1::2])
+
+
+class MappedCoordinates:
+    """Двоичный файл координат, отображённый в память.
+
+    Координаты читаются прямо из отображения без копирования файла;
+    точки Pair создаются только при обращении к ним."""
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as stream:
+            size = os.fstat(stream.fileno()).st_size
+            if size % _POINT.size:
+                raise ValueError("Размер файла координат не кратен 16 байтам")
+            # Пустой файл отобразить нельзя
+            self._buffer = (
+                mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            )
+        self._count = size // _POINT.size
+        self._closed = False
+        self._view: "Optional[memoryview[float]]" = None
+        if self._buffer is not None and _LITTLE_ENDIAN:
+            self._view = memoryview(self._buffer).cast("d")
+
+    def __enter__(self) -> "MappedCoordinates":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрытие файла. Если живы представления из get_view, отображение
+        освобождается при удалении последнего из них"""
+        self._closed = True
+        view, self._view = self._view, None
+        buffer, self._buffer = self._buffer, None
+        if view is not None:
+            view.release()
+        if buffer is not None:
+            try:
+                buffer.close()
+            except BufferError:
+                pass
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("Файл координат закрыт")
+
+    def __len__(self) -> int:
+        self._check_open()
+        return self._count
+
+    def get_view(self) -> "Optional[memoryview[float]]":
+        """Координаты x0, y0, x1, y1, ... как новый memoryview формата "d"
+        (None для пустого файла или при обратном порядке байтов)"""
+        self._check_open()
+        if self._view is None or self._buffer is None:
+            return None
+        return memoryview(self._buffer).cast("d")
+
+    def __getitem__(self, index: int) -> Pair:
+        self._check_open()
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Index {index} out of range [0, {self._count - 1}]")
+        if self._view is not None:
+            return _pair(self._view[2 * index], self._view[2 * index + 1])
+        # Проверка на None для mypy
+        if self._buffer is None:
+            raise IndexError(f"Index {index} out of range")
+        return _pair(*_POINT.unpack_from(self._buffer, index * _POINT.size))
+
+    def __iter__(self) -> Iterator[Pair]:
+        self._check_open()
+        if self._view is not None:
+            starts = range(0, 2 * self._count, 2 * _ITER_CHUNK)
+            return chain.from_iterable(map(_chunk_pairs, repeat(self._view), starts))
+        if self._buffer is None:
+            return iter(())
+        return (_pair(x, y) for x, y in _POINT.iter_unpack(self._buffer))
+
+    def to_pair_array(self) -> PairArray:
+        """Копия координат в столбцы PairArray"""
+        self._check_open()
+        data = array("d")
+        if self._buffer is not None:
+            data.frombytes(self._buffer)
+        if not _LITTLE_ENDIAN:
+            data.byteswap()
+        return PairArray(data[0::2], data[1::2])
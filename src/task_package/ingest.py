@@ -0,0 +1,91 @@
+import asyncio
+from typing import AsyncIterable, Callable, Iterable, NamedTuple, Optional
+
+from .zad2 import Goods, Receipt
+
+
+class LineItem(NamedTuple):
+    """Строка товара "код,наименование,цена,количество" для чека с номером"""
+
+    receipt_number: int
+    line: str
+
+
+class IngestRejection(NamedTuple):
+    """Отклонённая строка: не разобрана или чек уже заполнен"""
+
+    receipt_number: int
+    line: str
+    reason: str
+
+
+class ReceiptIngestor:
+    """Асинхронный приём строк товаров от многих источников.
+
+    Источники кладут строки в ограниченную очередь и ждут, когда она
+    заполнена, - так медленная обработка притормаживает источники.
+    Один обработчик разбирает строки в Goods и добавляет их в чеки;
+    отклонённые строки передаются в on_reject."""
+
+    def __init__(
+        self,
+        receipt_size: int = Receipt.MAX_SIZE,
+        queue_size: int = 1024,
+        on_reject: Optional[Callable[[IngestRejection], None]] = None,
+    ) -> None:
+        self._receipt_size = receipt_size
+        self._queue_size = queue_size
+        self._on_reject = on_reject
+        self._receipts: dict[int, Receipt] = {}
+
+    def get_receipts(self) -> dict[int, Receipt]:
+        """Собранные чеки по номерам"""
+        return self._receipts
+
+    def _reject(self, item: LineItem, reason: str) -> None:
+        if self._on_reject is not None:
+            self._on_reject(IngestRejection(item.receipt_number, item.line, reason))
+
+    def _accept(self, item: LineItem) -> None:
+        try:
+            goods = Goods(item.line)
+        except ValueError as e:
+            self._reject(item, str(e))
+            return
+        receipt = self._receipts.get(item.receipt_number)
+        if receipt is None:
+            receipt = Receipt(item.receipt_number, self._receipt_size)
+            self._receipts[item.receipt_number] = receipt
+        if not receipt.add_goods(goods):
+            self._reject(item, "Достигнут максимальный размер чека")
+
+    async def _consume(self, queue: "asyncio.Queue[Optional[LineItem]]") -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            self._accept(item)
+
+    @staticmethod
+    async def _produce(
+        queue: "asyncio.Queue[Optional[LineItem]]", producer: AsyncIterable[LineItem]
+    ) -> None:
+        async for item in producer:
+            await queue.put(LineItem(*item))
+
+    async def run(
+        self, producers: Iterable[AsyncIterable[LineItem]]
+    ) -> dict[int, Receipt]:
+        """Приём строк от всех источников до их исчерпания.
+
+        Ошибка источника или обработчика отменяет остальные задачи, в том
+        числе источники, ждущие места в очереди, и передаётся вызывающему
+        в ExceptionGroup"""
+        queue: asyncio.Queue[Optional[LineItem]] = asyncio.Queue(self._queue_size)
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._consume(queue))
+            async with asyncio.TaskGroup() as producing:
+                for producer in producers:
+                    producing.create_task(self._produce(queue, producer))
+            await queue.put(None)
+        return self._receipts
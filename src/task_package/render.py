@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Protocol, TextIO
+
+from .zad2 import BaseGoods
+
+
+class _RenderableReceipt(Protocol):
+    def __iter__(self) -> Iterator[BaseGoods]:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def size(self) -> int:
+        ...
+
+    def get_receipt_number(self) -> int:
+        ...
+
+    def get_date_time(self) -> datetime:
+        ...
+
+    def get_total_sum(self) -> float:
+        ...
+
+
+class ReceiptRenderer:
+    """Потоковый вывод чеков в текстовый поток (файл, сокет через makefile).
+
+    Текст совпадает с str(receipt). Строки копятся в переиспользуемом
+    буфере и записываются в поток порциями по buffer_lines строк.
+    Отформатированная дата кэшируется, так как чеки одной секунды
+    имеют одинаковую строку даты."""
+
+    def __init__(
+        self, stream: TextIO, buffer_lines: int = 512, separator: str = "\n"
+    ) -> None:
+        self._stream = stream
+        self._buffer_lines = buffer_lines
+        self._separator = separator
+        self._buffer: list[str] = []
+        self._date_key: Optional[datetime] = None
+        self._date_text = ""
+
+    def _format_date(self, date_time: datetime) -> str:
+        key = date_time.replace(microsecond=0)
+        if key != self._date_key:
+            self._date_key = key
+            self._date_text = f"Дата: {key.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        return self._date_text
+
+    def render(self, receipt: _RenderableReceipt) -> None:
+        """Вывод одного чека"""
+        buffer = self._buffer
+        append = buffer.append
+        append(f"Товарный чек №{receipt.get_receipt_number()}\n")
+        append(self._format_date(receipt.get_date_time()))
+        append(f"Товаров: {len(receipt)}/{receipt.size()}\nСписок товаров:\n")
+        number = 0
+        for goods in receipt:
+            number += 1
+            append(
+                f"  {number}. Товар [Код: {goods.get_code()}, Наименование: {goods.get_name()}, "
+                f"Цена: {goods.get_price()}, Количество: {goods.get_quantity()}, "
+                f"Сумма: {goods.get_total()}]\n"
+            )
+            if len(buffer) >= self._buffer_lines:
+                self._write()
+        append(f"Общая сумма: {receipt.get_total_sum():.2f}\n{self._separator}")
+        if len(buffer) >= self._buffer_lines:
+            self._write()
+
+    def render_many(self, receipts: Iterable[_RenderableReceipt]) -> int:
+        """Вывод набора чеков за один вызов. Возвращает их количество"""
+        rendered = 0
+        for receipt in receipts:
+            self.render(receipt)
+            rendered += 1
+        self.flush()
+        return rendered
+
+    def _write(self) -> None:
+        self._stream.write("".join(self._buffer))
+        self._buffer.clear()
+
+    def flush(self) -> None:
+        """Запись накопленного буфера и сброс потока"""
+        if self._buffer:
+            self._write()
+        self._stream.flush()
@@ -0,0 +1,308 @@
+import heapq
+import math
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from .zad1 import Pair, PairArray
+
+Points = Union[Sequence[Pair], PairArray]
+
+
+def _columns(
+    points: Union[Iterable[Pair], PairArray]
+) -> tuple[list[float], list[float]]:
+    """Столбцы координат набора точек"""
+    if isinstance(points, PairArray):
+        return list(points.first), list(points.second)
+    xs: list[float] = []
+    ys: list[float] = []
+    for point in points:
+        xs.append(point.first)
+        ys.append(point.second)
+    return xs, ys
+
+
+class KDTree:
+    """Двумерное k-d дерево над набором точек для поиска ближайших соседей
+    и точек в радиусе.
+
+    Строится один раз по всему набору (деление по медиане по оси с большим
+    разбросом); листья хранят до leaf_size точек. Запросы возвращают
+    индексы точек в исходном наборе."""
+
+    def __init__(self, points: Points, leaf_size: int = 16) -> None:
+        if leaf_size < 1:
+            raise ValueError("Размер листа должен быть положительным")
+        xs, ys = _columns(points)
+        order = list(range(len(xs)))
+        # Узлы: ось деления (-1 у листа), граница, потомки, отрезок order
+        self._axes: list[int] = []
+        self._splits: list[float] = []
+        self._lefts: list[int] = []
+        self._rights: list[int] = []
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        if order:
+            self._build(xs, ys, order, leaf_size)
+        # Координаты в порядке листьев, чтобы лист читался подряд
+        self._indices = order
+        self._xs = [xs[i] for i in order]
+        self._ys = [ys[i] for i in order]
+
+    def _node(self, start: int, end: int) -> int:
+        self._axes.append(-1)
+        self._splits.append(0.0)
+        self._lefts.append(-1)
+        self._rights.append(-1)
+        self._starts.append(start)
+        self._ends.append(end)
+        return len(self._axes) - 1
+
+    def _build(
+        self, xs: list[float], ys: list[float], order: list[int], leaf_size: int
+    ) -> None:
+        stack = [self._node(0, len(order))]
+        while stack:
+            node = stack.pop()
+            start, end = self._starts[node], self._ends[node]
+            if end - start <= leaf_size:
+                continue
+            segment = order[start:end]
+            spread_x = max(xs[i] for i in segment) - min(xs[i] for i in segment)
+            spread_y = max(ys[i] for i in segment) - min(ys[i] for i in segment)
+            axis = 0 if spread_x >= spread_y else 1
+            coords = xs if axis == 0 else ys
+            segment.sort(key=coords.__getitem__)
+            order[start:end] = segment
+            middle = (start + end) // 2
+            # Слева точки не больше границы, справа - не меньше
+            self._axes[node] = axis
+            self._splits[node] = coords[order[middle]]
+            self._lefts[node] = self._node(start, middle)
+            self._rights[node] = self._node(middle, end)
+            stack.append(self._lefts[node])
+            stack.append(self._rights[node])
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def nearest(self, point: Pair, k: int = 1) -> list[tuple[float, int]]:
+        """k ближайших точек: пары (расстояние, индекс) по возрастанию
+        расстояния, при равных расстояниях - по индексу"""
+        if k <= 0 or not self._indices:
+            return []
+        qx, qy = point.first, point.second
+        xs, ys, indices = self._xs, self._ys, self._indices
+        # Куча k лучших кандидатов: (-квадрат расстояния, -индекс)
+        best: list[tuple[float, int]] = []
+        stack: list[tuple[int, float]] = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+            axis = self._axes[node]
+            if axis < 0:
+                for i in range(self._starts[node], self._ends[node]):
+                    dx = xs[i] - qx
+                    dy = ys[i] - qy
+                    item = (-(dx * dx + dy * dy), -indices[i])
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                continue
+            diff = (qx if axis == 0 else qy) - self._splits[node]
+            near, far = (
+                (self._lefts[node], self._rights[node])
+                if diff < 0
+                else (self._rights[node], self._lefts[node])
+            )
+            # Дальнее поддерево проверяется после ближнего
+            stack.append((far, diff * diff))
+            stack.append((near, bound))
+        return [(math.sqrt(-d2), -index) for d2, index in sorted(best, reverse=True)]
+
+    def within(self, point: Pair, radius: float) -> list[int]:
+        """Индексы точек на расстоянии не больше radius (по возрастанию)"""
+        if radius < 0:
+            raise ValueError("Радиус не может быть отрицательным")
+        qx, qy = point.first, point.second
+        r2 = radius * radius
+        xs, ys, indices = self._xs, self._ys, self._indices
+        found: list[int] = []
+        stack = [0] if indices else []
+        while stack:
+            node = stack.pop()
+            axis = self._axes[node]
+            if axis < 0:
+                for i in range(self._starts[node], self._ends[node]):
+                    dx = xs[i] - qx
+                    dy = ys[i] - qy
+                    if dx * dx + dy * dy <= r2:
+                        found.append(indices[i])
+                continue
+            diff = (qx if axis == 0 else qy) - self._splits[node]
+            if diff <= radius:
+                stack.append(self._lefts[node])
+            if diff >= -radius:
+                stack.append(self._rights[node])
+        found.sort()
+        return found
+
+    def nearest_many(
+        self, points: Union[Iterable[Pair], PairArray], k: int = 1
+    ) -> list[list[tuple[float, int]]]:
+        """Поиск k ближайших для каждой точки набора"""
+        return [self.nearest(point, k) for point in points]
+
+    def within_many(
+        self, points: Union[Iterable[Pair], PairArray], radius: float
+    ) -> list[list[int]]:
+        """Поиск точек в радиусе для каждой точки набора"""
+        return [self.within(point, radius) for point in points]
+
+
+Cell = tuple[int, int]
+
+# Соседние клетки "вперёд": каждая пара соседних клеток просматривается один раз
+_FORWARD = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class SpatialHash:
+    """Равномерная сетка с клетками cell_size x cell_size для изменяемого
+    набора точек Pair.
+
+    Точки хранятся по ссылке; вставка, удаление и перемещение затрагивают
+    одну-две клетки. Если точки изменяются на месте (например, через +=),
+    их клетки обновляются вызовом move или refresh."""
+
+    def __init__(self, cell_size: float) -> None:
+        if not cell_size > 0:
+            raise ValueError("Размер клетки должен быть положительным")
+        self._cell_size = cell_size
+        # Клетка -> {id(точки): точка}, и клетка каждой точки
+        self._cells: dict[Cell, dict[int, Pair]] = {}
+        self._where: dict[int, Cell] = {}
+
+    def get_cell_size(self) -> float:
+        return self._cell_size
+
+    def cell_of(self, point: Pair) -> Cell:
+        return (
+            math.floor(point.first / self._cell_size),
+            math.floor(point.second / self._cell_size),
+        )
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, point: object) -> bool:
+        return id(point) in self._where
+
+    def __iter__(self) -> Iterator[Pair]:
+        for bucket in self._cells.values():
+            yield from bucket.values()
+
+    def insert(self, point: Pair) -> None:
+        if id(point) in self._where:
+            raise ValueError("Точка уже есть в сетке")
+        cell = self.cell_of(point)
+        self._where[id(point)] = cell
+        self._cells.setdefault(cell, {})[id(point)] = point
+
+    def remove(self, point: Pair) -> None:
+        cell = self._where.pop(id(point), None)
+        if cell is None:
+            raise KeyError("Точка отсутствует в сетке")
+        self._discard(cell, point)
+
+    def _discard(self, cell: Cell, point: Pair) -> None:
+        bucket = self._cells[cell]
+        del bucket[id(point)]
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, point: Pair, delta: Optional[Pair] = None) -> None:
+        """Сдвиг точки на delta (если задан) и перенос в её новую клетку"""
+        old = self._where.get(id(point))
+        if old is None:
+            raise KeyError("Точка отсутствует в сетке")
+        if delta is not None:
+            point += delta
+        cell = self.cell_of(point)
+        if cell != old:
+            self._discard(old, point)
+            self._where[id(point)] = cell
+            self._cells.setdefault(cell, {})[id(point)] = point
+
+    def refresh(self) -> int:
+        """Перенос всех изменившихся на месте точек в их клетки.
+        Возвращает число перенесённых точек"""
+        moved = [
+            (point, cell)
+            for cell, bucket in self._cells.items()
+            for point in bucket.values()
+            if self.cell_of(point) != cell
+        ]
+        for point, cell in moved:
+            self._discard(cell, point)
+            new_cell = self.cell_of(point)
+            self._where[id(point)] = new_cell
+            self._cells.setdefault(new_cell, {})[id(point)] = point
+        return len(moved)
+
+    def query_box(self, low: Pair, high: Pair) -> list[Pair]:
+        """Точки в прямоугольнике low <= точка <= high (по обеим осям)"""
+        (x0, y0), (x1, y1) = self.cell_of(low), self.cell_of(high)
+        found: list[Pair] = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            # Прямоугольник больше занятой области - обходятся занятые клетки
+            buckets: Iterable[dict[int, Pair]] = (
+                bucket
+                for (x, y), bucket in self._cells.items()
+                if x0 <= x <= x1 and y0 <= y <= y1
+            )
+        else:
+            buckets = (
+                self._cells[(x, y)]
+                for x in range(x0, x1 + 1)
+                for y in range(y0, y1 + 1)
+                if (x, y) in self._cells
+            )
+        for bucket in buckets:
+            for point in bucket.values():
+                if (
+                    low.first <= point.first <= high.first
+                    and low.second <= point.second <= high.second
+                ):
+                    found.append(point)
+        return found
+
+    def neighbours(self, point: Pair) -> list[Pair]:
+        """Точки в клетке точки и восьми соседних (кроме самой точки)"""
+        cx, cy = self.cell_of(point)
+        found: list[Pair] = []
+        for x in (cx - 1, cx, cx + 1):
+            for y in (cy - 1, cy, cy + 1):
+                bucket = self._cells.get((x, y))
+                if bucket:
+                    found.extend(
+                        other for other in bucket.values() if other is not point
+                    )
+        return found
+
+    def candidate_pairs(self) -> Iterator[tuple[Pair, Pair]]:
+        """Пары точек в одной или соседних клетках - кандидаты на
+        столкновение при расстоянии не больше cell_size. Каждая пара
+        выдаётся один раз"""
+        cells = self._cells
+        for (cx, cy), bucket in cells.items():
+            points = list(bucket.values())
+            for i, point in enumerate(points):
+                for other in points[i + 1 :]:
+                    yield point, other
+            for dx, dy in _FORWARD:
+                neighbour = cells.get((cx + dx, cy + dy))
+                if neighbour:
+                    for point in points:
+                        for other in neighbour.values():
+                            yield point, other
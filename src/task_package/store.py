@@ -0,0 +1,159 @@
+import os
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+from .archive import (
+    ArchivedReceipt,
+    ReceiptArchive,
+    pack_receipt,
+    to_timestamp,
+    write_header,
+)
+from .zad2 import Receipt
+
+
+class ReceiptStore:
+    """Хранилище чеков: журнал только на дозапись и индексы в памяти.
+
+    Чеки пишутся в файл в формате архива (см. archive.py). Поддерживаются
+    индексы по номеру чека, по времени и по коду товара; списки
+    (время, смещение) отсортированы, поэтому выборка по интервалу времени
+    выполняется двоичным поиском, без просмотра всего журнала.
+    При открытии существующего файла индексы восстанавливаются из него."""
+
+    def __init__(self, path: Union[str, os.PathLike[str]]) -> None:
+        self._path = path
+        self._log = open(path, "ab")
+        try:
+            self._open()
+        except BaseException:
+            self._log.close()
+            raise
+
+    def _open(self) -> None:
+        """Проверка журнала и построение индексов по его записям"""
+        if self._log.tell() == 0:
+            write_header(self._log)
+            self._log.flush()
+        self._end = self._log.tell()
+        self._archive: Optional[ReceiptArchive] = None
+        self._mapped_end = 0
+        self._by_number: dict[int, int] = {}
+        self._by_time: list[tuple[int, int]] = []
+        self._by_code: dict[int, list[tuple[int, int]]] = {}
+        reader = self._reader()
+        complete = reader.complete_end()
+        if complete < self._end:
+            # Оборванная последняя запись отбрасывается, чтобы дозапись
+            # продолжалась сразу после целых записей
+            reader.close()
+            self._archive = None
+            self._log.truncate(complete)
+            self._end = complete
+            reader = self._reader()
+        for offset in reader.offsets():
+            archived = reader.receipt_at(offset)
+            codes = [code for code, _, _ in archived.iter_lines()]
+            self._index(
+                offset, archived.get_timestamp(), archived.get_receipt_number(), codes
+            )
+
+    def __enter__(self) -> "ReceiptStore":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._log.close()
+        self._archive = None
+
+    def __len__(self) -> int:
+        return len(self._by_time)
+
+    def _reader(self) -> ReceiptArchive:
+        """Отображение журнала в память, обновляемое после дозаписи.
+        Прежнее отображение не закрывается явно: им могут пользоваться
+        ранее выданные чеки."""
+        if self._archive is None or self._mapped_end != self._end:
+            self._archive = ReceiptArchive(self._path)
+            self._mapped_end = self._end
+        return self._archive
+
+    def _index(
+        self, offset: int, timestamp: int, receipt_number: int, codes: list[int]
+    ) -> None:
+        self._by_number.setdefault(receipt_number, offset)
+        entry = (timestamp, offset)
+        insort(self._by_time, entry)
+        for code in set(codes):
+            postings = self._by_code.get(code)
+            if postings is None:
+                self._by_code[code] = [entry]
+            else:
+                insort(postings, entry)
+
+    def append(self, receipt: Receipt) -> int:
+        """Дозапись чека в журнал. Возвращает смещение записи"""
+        offset = self._end
+        self._end += self._log.write(pack_receipt(receipt))
+        self._log.flush()
+        codes = [goods.get_code() for goods in receipt]
+        self._index(
+            offset,
+            to_timestamp(receipt.get_date_time()),
+            receipt.get_receipt_number(),
+            codes,
+        )
+        return offset
+
+    def extend(self, receipts: Iterable[Receipt]) -> int:
+        """Дозапись набора чеков. Возвращает их количество"""
+        added = 0
+        for receipt in receipts:
+            self.append(receipt)
+            added += 1
+        return added
+
+    def get(self, receipt_number: int) -> Optional[ArchivedReceipt]:
+        """Поиск чека по номеру"""
+        offset = self._by_number.get(receipt_number)
+        if offset is None:
+            return None
+        return self._reader().receipt_at(offset)
+
+    @staticmethod
+    def _window(
+        entries: list[tuple[int, int]],
+        start: Optional[datetime],
+        end: Optional[datetime],
+    ) -> list[tuple[int, int]]:
+        low = 0 if start is None else bisect_left(entries, (to_timestamp(start), -1))
+        high = (
+            len(entries)
+            if end is None
+            else bisect_left(entries, (to_timestamp(end), -1), low)
+        )
+        return entries[low:high]
+
+    def _receipts(self, entries: list[tuple[int, int]]) -> Iterator[ArchivedReceipt]:
+        reader = self._reader()
+        for _, offset in entries:
+            yield reader.receipt_at(offset)
+
+    def between(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> Iterator[ArchivedReceipt]:
+        """Чеки со временем в интервале [start, end) по возрастанию времени"""
+        return self._receipts(self._window(self._by_time, start, end))
+
+    def with_code(
+        self,
+        code: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[ArchivedReceipt]:
+        """Чеки, содержащие товар с кодом, со временем в интервале [start, end)"""
+        postings = self._by_code.get(code, [])
+        return self._receipts(self._window(postings, start, end))
@@ -1,11 +1,16 @@
 import math
-from typing import Any, Iterator, Union
+from array import array
+from itertools import repeat
+from operator import add, mul, sub, truediv
+from typing import Any, Callable, Iterable, Iterator, Union, overload
 
 
 class Pair:
     """Класс для работы с координатами точки
     с использованием перегрузки операторов"""
 
+    __slots__ = ("first", "second")
+
     def __init__(self, first: float = 0.0, second: float = 0.0) -> None:
         try:
             self.first = float(first)
@@ -33,21 +38,26 @@ class Pair:
         return not self.__eq__(other)
 
     def __add__(self, other: "Pair") -> "Pair":
+        if isinstance(other, PairArray):
+            # Точка и набор складываются в PairArray.__radd__
+            return NotImplemented
         if not isinstance(other, Pair):
             raise TypeError("Можно складывать только объекты Pair")
-        return Pair(self.first + other.first, self.second + other.second)
+        return _pair(self.first + other.first, self.second + other.second)
 
     def __sub__(self, other: "Pair") -> "Pair":
+        if isinstance(other, PairArray):
+            return NotImplemented
         if not isinstance(other, Pair):
             raise TypeError("Можно вычитать только объекты Pair")
-        return Pair(self.first - other.first, self.second - other.second)
+        return _pair(self.first - other.first, self.second - other.second)
 
     def __mul__(self, scalar: Union[float, int]) -> "Pair":
         try:
             scalar_float = float(scalar)
         except (ValueError, TypeError):
             raise TypeError("Можно умножать только на число")
-        return Pair(self.first * scalar_float, self.second * scalar_float)
+        return _pair(self.first * scalar_float, self.second * scalar_float)
 
     def __rmul__(self, scalar: Union[float, int]) -> "Pair":
         """Умножение скаляра на координаты (правая сторона)"""
@@ -61,7 +71,7 @@ class Pair:
             raise TypeError("Можно делить только на число")
         if scalar_float == 0:
             raise ZeroDivisionError("Деление на ноль")
-        return Pair(self.first / scalar_float, self.second / scalar_float)
+        return _pair(self.first / scalar_float, self.second / scalar_float)
 
     def __iadd__(self, other: "Pair") -> "Pair":
         """+= оператор"""
@@ -137,6 +147,187 @@ class Pair:
             raise ValueError("Введите дробное число Float") from e
 
 
+_new = object.__new__
+
+
+def _pair(first: float, second: float) -> Pair:
+    """Создание точки из уже проверенных чисел float без повторного
+    преобразования (для результатов операций)"""
+    pair = _new(Pair)
+    pair.first = first
+    pair.second = second
+    return pair
+
+
+class PairArray:
+    """Набор точек в двух непрерывных столбцах float64 (array("d")).
+
+    Операции + - * / выполняются поэлементно без создания объектов Pair;
+    вторым операндом может быть PairArray той же длины, одна точка Pair
+    (для + и -) или число (для * и /)."""
+
+    def __init__(
+        self, firsts: Iterable[float] = (), seconds: Iterable[float] = ()
+    ) -> None:
+        try:
+            self.first = array("d", firsts)
+            self.second = array("d", seconds)
+        except TypeError as e:
+            raise ValueError("Введите дробное число Float") from e
+        if len(self.first) != len(self.second):
+            raise ValueError("Столбцы координат должны быть одной длины")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Pair]) -> "PairArray":
+        """Набор из последовательности точек Pair"""
+        result = cls()
+        for pair in pairs:
+            result.first.append(pair.first)
+            result.second.append(pair.second)
+        return result
+
+    def to_pairs(self) -> list[Pair]:
+        return list(map(_pair, self.first, self.second))
+
+    def __len__(self) -> int:
+        return len(self.first)
+
+    def __iter__(self) -> Iterator[Pair]:
+        return map(_pair, self.first, self.second)
+
+    @overload
+    def __getitem__(self, index: int) -> Pair:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PairArray":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Pair, "PairArray"]:
+        if isinstance(index, slice):
+            return PairArray(self.first[index], self.second[index])
+        return _pair(self.first[index], self.second[index])
+
+    def __repr__(self) -> str:
+        return f"PairArray({list(self.first)}, {list(self.second)})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PairArray) or len(self) != len(other):
+            return False
+        return all(map(math.isclose, self.first, other.first)) and all(
+            map(math.isclose, self.second, other.second)
+        )
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def _points(
+        self, other: Any, message: str
+    ) -> tuple[Iterable[float], Iterable[float]]:
+        """Координаты второго операнда + и -: набор или одна точка"""
+        if isinstance(other, PairArray):
+            if len(other) != len(self):
+                raise ValueError("Наборы точек должны быть одной длины")
+            return other.first, other.second
+        if isinstance(other, Pair):
+            return repeat(other.first), repeat(other.second)
+        raise TypeError(message)
+
+    def _factors(
+        self, other: Any, message: str
+    ) -> tuple[Iterable[float], Iterable[float]]:
+        """Множители для * и /: покоординатно из набора или одно число"""
+        if isinstance(other, PairArray):
+            if len(other) != len(self):
+                raise ValueError("Наборы точек должны быть одной длины")
+            return other.first, other.second
+        try:
+            scalar = float(other)
+        except (ValueError, TypeError):
+            raise TypeError(message)
+        return repeat(scalar), repeat(scalar)
+
+    def _apply(
+        self,
+        op: Callable[[float, float], float],
+        operands: tuple[Iterable[float], Iterable[float]],
+    ) -> "PairArray":
+        result = PairArray()
+        result.first = array("d", map(op, self.first, operands[0]))
+        result.second = array("d", map(op, self.second, operands[1]))
+        return result
+
+    def __add__(self, other: Union["PairArray", Pair]) -> "PairArray":
+        return self._apply(
+            add,
+            self._points(other, "Можно складывать только объекты Pair или PairArray"),
+        )
+
+    def __sub__(self, other: Union["PairArray", Pair]) -> "PairArray":
+        return self._apply(
+            sub, self._points(other, "Можно вычитать только объекты Pair или PairArray")
+        )
+
+    def __radd__(self, other: Pair) -> "PairArray":
+        return self.__add__(other)
+
+    def __rsub__(self, other: Pair) -> "PairArray":
+        """Точка минус каждая точка набора"""
+        return self._apply(
+            lambda x, y: y - x,
+            self._points(other, "Можно вычитать только объекты Pair или PairArray"),
+        )
+
+    def __mul__(self, other: Union["PairArray", float, int]) -> "PairArray":
+        return self._apply(
+            mul, self._factors(other, "Можно умножать только на число или PairArray")
+        )
+
+    def __rmul__(self, scalar: Union[float, int]) -> "PairArray":
+        return self.__mul__(scalar)
+
+    def __truediv__(self, other: Union["PairArray", float, int]) -> "PairArray":
+        divisors = self._factors(other, "Можно делить только на число или PairArray")
+        if not isinstance(other, PairArray) and float(other) == 0:
+            raise ZeroDivisionError("Деление на ноль")
+        return self._apply(truediv, divisors)
+
+    def __iadd__(self, other: Union["PairArray", Pair]) -> "PairArray":
+        """+= оператор (столбцы заменяются новыми)"""
+        result = self + other
+        self.first, self.second = result.first, result.second
+        return self
+
+    def __isub__(self, other: Union["PairArray", Pair]) -> "PairArray":
+        """-= оператор"""
+        result = self - other
+        self.first, self.second = result.first, result.second
+        return self
+
+    def __imul__(self, other: Union["PairArray", float, int]) -> "PairArray":
+        """*= оператор"""
+        result = self * other
+        self.first, self.second = result.first, result.second
+        return self
+
+    def __itruediv__(self, other: Union["PairArray", float, int]) -> "PairArray":
+        """/= оператор"""
+        result = self / other
+        self.first, self.second = result.first, result.second
+        return self
+
+    def __abs__(self) -> "array[float]":
+        """Расстояния от начала координат до всех точек"""
+        return array("d", map(math.hypot, self.first, self.second))
+
+    def distance(self) -> "array[float]":
+        return abs(self)
+
+    def distance_to(self, other: Union["PairArray", Pair]) -> "array[float]":
+        """Расстояния до точки или до соответствующих точек другого набора"""
+        return abs(self - other)
+
+
 if __name__ == "__main__":
     point1 = Pair(1.2, 2.4)
     point2 = Pair(3.1, 1.5)
@@ -172,3 +363,8 @@ if __name__ == "__main__":
     print("\nИтерация:")
     for coord in point1:
         print("Координата:", coord)
+
+    print("\nНабор точек:")
+    points = PairArray.from_pairs([point1, point2, point3])
+    print("points + point1 =", points + point1)
+    print("Расстояния:", list(points.distance()))
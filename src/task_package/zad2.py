@@ -1,16 +1,194 @@
+import heapq
+import math
+import sys
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime
-from typing import Any, Optional
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from itertools import accumulate, islice, repeat
+from operator import mul
+from threading import Lock, RLock
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
 
 
-class Goods:
+# Число копеек в рубле для представления денег в целых младших единицах
+MINOR_UNITS = 100
+
+
+def to_minor_units(amount: Any) -> int:
+    """Перевод суммы в целые копейки с округлением половины вверх.
+
+    Вещественное число переводится через кратчайшую десятичную запись,
+    поэтому to_minor_units(2.675) == 268, как и для строки "2.675"."""
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    try:
+        cents = Decimal(str(amount).strip()) * MINOR_UNITS
+    except InvalidOperation as e:
+        raise ValueError(f"Некорректная сумма: {amount!r}") from e
+    return int(cents.to_integral_value(ROUND_HALF_UP))
+
+
+class GoodsParseError(NamedTuple):
+    """Сведения о строке, которую не удалось разобрать как товар"""
+
+    line_number: int
+    line: str
+    message: str
+
+
+# Чеки, содержащие товар: нет, слабая ссылка на единственный чек или
+# слабый словарь "чек -> число вхождений". Товар не удерживает чеки.
+_Owners = Union[None, "weakref.ref[Receipt]", "weakref.WeakKeyDictionary[Receipt, int]"]
+
+
+class BaseGoods:
+    """Общая часть товаров: код, количество, чеки-владельцы и операции над
+    полями. Наименование и цена хранятся в подклассах: у Goods - в слотах,
+    у строк каталога - в каталоге."""
+
+    __slots__ = ("_code", "_quantity", "_owners")
+    _code: int
+    _name: str
+    _price: float
+    _quantity: int
+    # Чеки, в которых находится товар (для поддержания их индексов)
+    _owners: _Owners
+
+    # Получение полей данных с помощью функций get
+    def get_code(self) -> int:
+        return self._code
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_price(self) -> float:
+        return self._price
+
+    def get_quantity(self) -> int:
+        return self._quantity
+
+    # Установка полей данных с помощью функций set
+    def set_code(self, code: int) -> None:
+        old_code = self._code
+        self._code = code
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_code_changed(self, old_code, code)
+
+    def set_quantity(self, quantity: int) -> None:
+        old_quantity = self._quantity
+        self._quantity = quantity
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_amount_changed(self, self._price, old_quantity)
+
+    def get_total(self) -> float:
+        """Cтоимость за один вид товара"""
+        return self._price * self._quantity
+
+    def get_total_cents(self) -> int:
+        """Cтоимость за один вид товара в копейках (цена округляется до копеек)"""
+        return self._line_total_cents(self._price, self._quantity)
+
+    # Стоимость строки по сохранённым значениям полей (для пересчёта итогов
+    # чека после изменения цены или количества)
+    def _line_total(self, price: Any, quantity: int) -> float:
+        return price * quantity
+
+    def _line_total_cents(self, price: Any, quantity: int) -> int:
+        return to_minor_units(price) * quantity
+
+    def __str__(self) -> str:
+        return f"Товар [Код: {self._code}, Наименование: {self._name}, Цена: {self._price}, Количество: {self._quantity}, Сумма: {self.get_total()}]"
+
+    def copy(self) -> "BaseGoods":
+        """Независимая копия товара (не входящая ни в один чек)"""
+        clone = Goods()
+        clone._code = self.get_code()
+        clone._name = self.get_name()
+        clone._price = self.get_price()
+        clone._quantity = self.get_quantity()
+        return clone
+
+    def same_as(self, other: "BaseGoods") -> bool:
+        """Совпадение всех полей товара"""
+        return (
+            self.get_code() == other.get_code()
+            and self.get_name() == other.get_name()
+            and self.get_price() == other.get_price()
+            and self.get_quantity() == other.get_quantity()
+        )
+
+    def _attach(self, receipt: "Receipt") -> None:
+        """Регистрация чека, содержащего товар"""
+        owners = self._owners
+        if owners is None:
+            # Ссылка без обработчика общая для всех строк одного чека
+            self._owners = weakref.ref(receipt)
+            return
+        if not isinstance(owners, weakref.ref):
+            owners[receipt] = owners.get(receipt, 0) + 1
+            return
+        current = owners()
+        if current is None:
+            # Ссылка без обработчика общая для всех строк одного чека
+            self._owners = weakref.ref(receipt)
+        else:
+            mapping = weakref.WeakKeyDictionary({current: 1})
+            mapping[receipt] = mapping.get(receipt, 0) + 1
+            self._owners = mapping
+
+    def _detach(self, receipt: "Receipt") -> None:
+        """Отмена регистрации чека (одно вхождение)"""
+        owners = self._owners
+        if owners is None:
+            return
+        if isinstance(owners, weakref.ref):
+            if owners() is receipt:
+                self._owners = None
+            return
+        count = owners.pop(receipt, 0)
+        if count > 1:
+            owners[receipt] = count - 1
+        elif not owners:
+            self._owners = None
+
+    def _receipts(self) -> list["Receipt"]:
+        """Существующие чеки с товаром, по одному на каждое вхождение"""
+        owners = self._owners
+        if owners is None:
+            return []
+        if isinstance(owners, weakref.ref):
+            receipt = owners()
+            return [] if receipt is None else [receipt]
+        return [receipt for receipt, count in owners.items() for _ in range(count)]
+
+
+class Goods(BaseGoods):
     MAX_SIZE = 1000
 
+    # Компактное размещение без __dict__ у каждого экземпляра
+    __slots__ = ("_name", "_price")
+
     def __init__(self, *args: Any) -> None:
         if len(args) == 1 and isinstance(args[0], str):
             # инициализация массива "код,наименование,цена,количество"
             code_str, name, price_str, quantity_str = args[0].split(",")
             self._code = int(code_str)
-            self._name = name
+            # Одинаковые наименования разделяют один объект строки
+            self._name = sys.intern(name)
             self._price = float(price_str)
             self._quantity = int(quantity_str)
         else:
@@ -19,50 +197,339 @@ class Goods:
             self._name = ""
             self._price = 0.0
             self._quantity = 0
+        self._owners = None
 
-    # Получение полей данных с помощью функций get
-    def get_code(self) -> int:
-        return self._code
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Iterable[str],
+        on_error: Optional[Callable[[GoodsParseError], None]] = None,
+        batch_size: int = 1024,
+    ) -> Iterator["Goods"]:
+        """Потоковый разбор строк "код,наименование,цена,количество".
 
-    def get_name(self) -> str:
-        return self._name
+        Строки читаются порциями по batch_size, поэтому источник (например,
+        открытый файл) не загружается в память целиком. Пустые строки
+        пропускаются, ошибочные передаются в on_error и не прерывают разбор."""
+        iterator = iter(lines)
+        line_number = 0
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            for raw in batch:
+                line_number += 1
+                line = raw.rstrip("\r\n")
+                if not line:
+                    continue
+                try:
+                    goods = cls(line)
+                except ValueError as e:
+                    if on_error is not None:
+                        on_error(GoodsParseError(line_number, line, str(e)))
+                    continue
+                yield goods
 
-    def get_price(self) -> float:
-        return self._price
+    @staticmethod
+    def parse_batch(
+        block: Union[str, bytes], first_line_number: int = 1
+    ) -> "GoodsColumns":
+        """Разбор блока строк "код,наименование,цена,количество" в столбцы.
 
-    def get_quantity(self) -> int:
-        return self._quantity
-
-    # Установка полей данных с помощью функций set
-    def set_code(self, code: int) -> None:
-        self._code = code
+        Блок целиком разбивается на поля одним split, и каждый столбец
+        преобразуется одним map(int/float). Если в блоке есть ошибочные
+        или пустые строки, он разбирается построчно, а ошибки
+        сохраняются в errors с номерами строк."""
+        if isinstance(block, bytes):
+            block = block.decode("utf-8")
+        lines = block.splitlines()
+        columns = GoodsColumns()
+        if not lines:
+            return columns
+        if list(map(str.count, lines, repeat(",", len(lines)))).count(3) == len(lines):
+            fields = ",".join(lines).split(",")
+            try:
+                codes = array("q", map(int, fields[0::4]))
+                prices = array("d", map(float, fields[2::4]))
+                quantities = array("q", map(int, fields[3::4]))
+            except (ValueError, OverflowError):
+                pass
+            else:
+                columns.codes = codes
+                columns.names = list(map(sys.intern, fields[1::4]))
+                columns.prices = prices
+                columns.quantities = quantities
+                return columns
+        for line_number, line in enumerate(lines, first_line_number):
+            if line:
+                columns._append_line(line_number, line)
+        return columns
 
+    # Наименование и цена хранятся в слотах Goods
     def set_name(self, name: str) -> None:
-        self._name = name
+        self._name = sys.intern(name)
 
     def set_price(self, price: float) -> None:
+        old_price = self._price
         self._price = price
+        if self._owners is not None:
+            for owner in self._receipts():
+                owner._on_amount_changed(self, old_price, self._quantity)
 
-    def set_quantity(self, quantity: int) -> None:
-        self._quantity = quantity
+
+class GoodsColumns:
+    """Результат пакетного разбора товаров: столбцы и ошибочные строки"""
+
+    def __init__(self) -> None:
+        self.codes = array("q")
+        self.names: list[str] = []
+        self.prices = array("d")
+        self.quantities = array("q")
+        self.errors: list[GoodsParseError] = []
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    # Диапазон значений столбцов кодов и количеств (array "q")
+    _INT64 = range(-(2**63), 2**63)
+
+    def _append_line(self, line_number: int, line: str) -> None:
+        try:
+            code_str, name, price_str, quantity_str = line.split(",")
+            code, price, quantity = int(code_str), float(price_str), int(quantity_str)
+            if code not in self._INT64 or quantity not in self._INT64:
+                raise ValueError("Значение вне диапазона 64-битного целого")
+        except ValueError as e:
+            self.errors.append(GoodsParseError(line_number, line, str(e)))
+            return
+        self.codes.append(code)
+        self.names.append(sys.intern(name))
+        self.prices.append(price)
+        self.quantities.append(quantity)
+
+    def to_goods(self) -> list[Goods]:
+        """Создание объектов Goods по столбцам"""
+        result = []
+        new = Goods.__new__
+        for code, name, price, quantity in zip(
+            self.codes, self.names, self.prices, self.quantities
+        ):
+            # Поля уже проверены при разборе, конструктор не нужен
+            goods = new(Goods)
+            goods._owners = None
+            goods._code = code
+            goods._name = name
+            goods._price = price
+            goods._quantity = quantity
+            result.append(goods)
+        return result
+
+
+class FixedPointGoods(Goods):
+    """Товар с ценой, хранимой в целых копейках.
+
+    Интерфейс get_price/set_price по-прежнему работает с рублями,
+    get_price_cents/get_total_cents дают точные целые значения."""
+
+    __slots__ = ()
+    # Слот _price хранит целые копейки
+    _price: int
+
+    def __init__(self, *args: Any) -> None:
+        if len(args) == 1 and isinstance(args[0], str):
+            # Цена переводится в копейки из исходной записи, минуя float
+            code_str, name, price_str, quantity_str = args[0].split(",")
+            self._code = int(code_str)
+            self._name = sys.intern(name)
+            self._price = to_minor_units(price_str)
+            self._quantity = int(quantity_str)
+            self._owners = None
+        else:
+            super().__init__(*args)
+            self._price = to_minor_units(self._price)
+
+    def get_price(self) -> float:
+        return self._price / MINOR_UNITS
+
+    def set_price(self, price: float) -> None:
+        self.set_price_cents(to_minor_units(price))
+
+    def get_price_cents(self) -> int:
+        return self._price
+
+    def set_price_cents(self, price_cents: int) -> None:
+        super().set_price(price_cents)
 
     def get_total(self) -> float:
-        """Cтоимость за один вид товара"""
-        return self._price * self._quantity
+        return self._price * self._quantity / MINOR_UNITS
+
+    def copy(self) -> "FixedPointGoods":
+        """Независимая копия товара с ценой в копейках"""
+        clone = FixedPointGoods()
+        clone._code = self._code
+        clone._name = self._name
+        clone._price = self._price
+        clone._quantity = self._quantity
+        return clone
+
+    def _line_total(self, price: Any, quantity: int) -> float:
+        return price * quantity / MINOR_UNITS
+
+    def _line_total_cents(self, price: Any, quantity: int) -> int:
+        return price * quantity
 
     def __str__(self) -> str:
-        return f"Товар [Код: {self._code}, Наименование: {self._name}, Цена: {self._price}, Количество: {self._quantity}, Сумма: {self.get_total()}]"
+        return f"Товар [Код: {self._code}, Наименование: {self._name}, Цена: {self.get_price()}, Количество: {self._quantity}, Сумма: {self.get_total()}]"
+
+
+class ReceiptDiff(NamedTuple):
+    """Различия двух чеков по кодам товаров"""
+
+    added: list[BaseGoods]
+    removed: list[BaseGoods]
+    changed: list[tuple[BaseGoods, BaseGoods]]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+class ReceiptMetrics:
+    """Счётчики операций, гистограммы времени и обработчики событий чеков.
+
+    Подключается ко всем чекам класса (Receipt.set_default_metrics) или к
+    отдельному чеку (set_metrics). Без подключения чек только проверяет,
+    что метрики не заданы. Обработчики вызываются как
+    callback(событие, чек, значение) для счётчиков и замеров времени."""
+
+    # Верхние границы интервалов гистограммы времени, секунды
+    BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters: dict[str, int] = {}
+        # Событие -> (число попаданий в интервалы, последний - сверх BUCKETS)
+        self._histograms: dict[str, list[int]] = {}
+        self._sums: dict[str, float] = {}
+        self._callbacks: list[Callable[[str, "Receipt", float], None]] = []
+
+    def add_callback(self, callback: Callable[[str, "Receipt", float], None]) -> None:
+        self._callbacks.append(callback)
+
+    def remove_callback(
+        self, callback: Callable[[str, "Receipt", float], None]
+    ) -> None:
+        self._callbacks.remove(callback)
+
+    def count(self, event: str, receipt: "Receipt", value: int = 1) -> None:
+        """Увеличение счётчика события на value"""
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + value
+        for callback in self._callbacks:
+            callback(event, receipt, value)
+
+    def observe(self, event: str, receipt: "Receipt", seconds: float) -> None:
+        """Учёт длительности операции в гистограмме события"""
+        with self._lock:
+            histogram = self._histograms.get(event)
+            if histogram is None:
+                histogram = self._histograms[event] = [0] * (len(self.BUCKETS) + 1)
+                self._sums[event] = 0.0
+            histogram[bisect_left(self.BUCKETS, seconds)] += 1
+            self._sums[event] += seconds
+        for callback in self._callbacks:
+            callback(event, receipt, seconds)
+
+    def get_counter(self, event: str) -> int:
+        return self._counters.get(event, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._sums.clear()
+
+    def export(self) -> dict[str, Any]:
+        """Снимок метрик для передачи во внешнюю систему мониторинга.
+
+        Гистограммы накопительные: для каждой границы "le" - число
+        операций не дольше неё, "+Inf" - общее число операций."""
+        with self._lock:
+            timings = {}
+            for event, histogram in self._histograms.items():
+                cumulative = list(accumulate(histogram))
+                buckets = {str(bound): n for bound, n in zip(self.BUCKETS, cumulative)}
+                buckets["+Inf"] = cumulative[-1]
+                timings[event] = {
+                    "count": cumulative[-1],
+                    "sum": self._sums[event],
+                    "buckets": buckets,
+                }
+            return {"counters": dict(self._counters), "timings": timings}
 
 
 class Receipt:
     MAX_SIZE = 100
+    INITIAL_CAPACITY = 4
+    # Метрики по умолчанию для всех чеков класса (None - отключены)
+    _metrics: Optional[ReceiptMetrics] = None
+    # Класс товаров, создаваемых from_lines
+    _goods_class: type[Goods] = Goods
 
     def __init__(self, receipt_number: int, size: int = MAX_SIZE) -> None:
         self._receipt_number = receipt_number
         self._date_time = datetime.now()
         self._size = size
         self._count = 0  # Текущее количество элементов
-        self._goods_list: list[Optional[Goods]] = [None] * size
+        # Буфер растёт по мере заполнения (удвоением, но не более size)
+        self._goods_list: list[Optional[BaseGoods]] = []
+        # Занятые позиции, включая удалённые (None), и позиции удалённых
+        # записей по возрастанию
+        self._used = 0
+        self._holes: list[int] = []
+        # Индекс "код -> позиция в _goods_list"; для кода, встречающегося
+        # несколько раз, - список позиций по возрастанию
+        self._index: dict[int, Union[int, list[int]]] = {}
+        # Поддерживаемые при изменениях итоги чека; сумма накапливается с
+        # компенсацией (Ноймайер), _total_error - потерянные младшие разряды
+        self._total_sum = 0.0
+        self._total_error = 0.0
+        self._total_quantity = 0
+
+    @classmethod
+    def set_default_metrics(cls, metrics: Optional[ReceiptMetrics]) -> None:
+        """Подключение метрик ко всем чекам класса и его подклассов"""
+        cls._metrics = metrics
+
+    def set_metrics(self, metrics: Optional[ReceiptMetrics]) -> None:
+        """Подключение метрик к этому чеку (None - отключение для него)"""
+        self._metrics = metrics
+
+    def get_metrics(self) -> Optional[ReceiptMetrics]:
+        return self._metrics
+
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Iterable[str],
+        first_number: int = 1,
+        size: int = MAX_SIZE,
+        on_error: Optional[Callable[[GoodsParseError], None]] = None,
+        batch_size: int = 1024,
+    ) -> Iterator["Receipt"]:
+        """Потоковое заполнение чеков товарами из строк.
+
+        Заполненный до size чек выдаётся, и следующий товар попадает в новый
+        чек с очередным номером. Ошибочные строки передаются в on_error."""
+        if size <= 0:
+            raise ValueError("Размер чека должен быть положительным")
+        receipt = cls(first_number, size)
+        for goods in cls._goods_class.from_lines(lines, on_error, batch_size):
+            if not receipt.add_goods(goods):
+                yield receipt
+                receipt = cls(receipt.get_receipt_number() + 1, size)
+                receipt.add_goods(goods)
+        if len(receipt):
+            yield receipt
 
     def size(self) -> int:
         return self._size
@@ -77,91 +544,795 @@ class Receipt:
     def get_date_time(self) -> datetime:
         return self._date_time
 
-    def add_goods(self, goods: Goods) -> bool:
+    def get_total_quantity(self) -> int:
+        """Общее количество единиц товара в чеке"""
+        return self._total_quantity
+
+    def get_capacity(self) -> int:
+        """Текущая ёмкость буфера записей"""
+        return len(self._goods_list)
+
+    @staticmethod
+    def capacity_stats(receipts: Iterable["Receipt"]) -> dict[str, int]:
+        """Сводная статистика заполнения буферов по набору чеков"""
+        stats = {"receipts": 0, "count": 0, "capacity": 0, "size": 0, "buffer_bytes": 0}
+        for receipt in receipts:
+            stats["receipts"] += 1
+            stats["count"] += receipt._count
+            stats["capacity"] += len(receipt._goods_list)
+            stats["size"] += receipt._size
+            stats["buffer_bytes"] += sys.getsizeof(receipt._goods_list)
+        return stats
+
+    def _grow(self) -> None:
+        """Геометрическое увеличение ёмкости буфера с ограничением size"""
+        capacity = len(self._goods_list)
+        new_capacity = min(self._size, max(self.INITIAL_CAPACITY, capacity * 2))
+        self._goods_list.extend([None] * (new_capacity - capacity))
+
+    def _attach_goods(self, goods: BaseGoods) -> None:
+        goods._attach(self)
+
+    def _detach_goods(self, goods: BaseGoods) -> None:
+        goods._detach(self)
+
+    def _index_add(self, code: int, slot: int) -> None:
+        slots = self._index.get(code)
+        if slots is None:
+            self._index[code] = slot
+        elif isinstance(slots, int):
+            self._index[code] = [slots, slot] if slots < slot else [slot, slots]
+        else:
+            insort(slots, slot)
+
+    def _index_discard(self, code: int, slot: int) -> None:
+        slots = self._index.get(code)
+        if slots is None:
+            return
+        if isinstance(slots, int):
+            if slots == slot:
+                del self._index[code]
+        else:
+            slots.remove(slot)
+            if len(slots) == 1:
+                self._index[code] = slots[0]
+
+    def _slots_of(self, code: int) -> Sequence[int]:
+        """Позиции записей с кодом по возрастанию"""
+        slots = self._index.get(code, ())
+        return (slots,) if isinstance(slots, int) else slots
+
+    def _first_slot(self, code: int) -> Optional[int]:
+        """Позиция первой записи с кодом (None - записей нет)"""
+        slots = self._index.get(code)
+        if slots is None or isinstance(slots, int):
+            return slots
+        return slots[0]
+
+    def _add_to_total(self, value: float) -> None:
+        """Компенсированное прибавление к общей сумме чека"""
+        total = self._total_sum + value
+        if abs(self._total_sum) >= abs(value):
+            self._total_error += (self._total_sum - total) + value
+        else:
+            self._total_error += (value - total) + self._total_sum
+        self._total_sum = total
+
+    def _account(self, goods: BaseGoods, sign: int) -> None:
+        """Учёт товара в итогах чека (sign = 1 при добавлении, -1 при удалении)"""
+        # То же, что _add_to_total, без лишнего вызова на частом пути
+        value = sign * goods.get_total()
+        total_sum = self._total_sum
+        total = total_sum + value
+        if abs(total_sum) >= abs(value):
+            self._total_error += (total_sum - total) + value
+        else:
+            self._total_error += (value - total) + total_sum
+        self._total_sum = total
+        self._total_quantity += sign * goods._quantity
+        if self._count == 0:
+            # Пустой чек: сумма точно равна нулю
+            self._total_sum = 0.0
+            self._total_error = 0.0
+
+    def _on_amount_changed(
+        self, goods: BaseGoods, old_price: Any, old_quantity: int
+    ) -> None:
+        """Обновление итогов после изменения цены или количества товара"""
+        self._add_to_total(-goods._line_total(old_price, old_quantity))
+        self._add_to_total(goods.get_total())
+        self._total_quantity += goods.get_quantity() - old_quantity
+
+    def _index_move(self, code: int, old_slot: int, new_slot: int) -> None:
+        """Замена позиции записи в индексе при сдвиге влево"""
+        slots = self._index[code]
+        if isinstance(slots, int):
+            self._index[code] = new_slot
+        else:
+            slots[bisect_left(slots, old_slot)] = new_slot
+
+    def _slot(self, index: int) -> int:
+        """Позиция в _goods_list записи с номером index без уплотнения"""
+        holes = self._holes
+        if not holes or index < holes[0]:
+            return index
+        # Наименьшая позиция, до которой включительно index + 1 живых записей
+        return bisect_left(
+            range(self._used),
+            index + 1,
+            index,
+            index + len(holes) + 1,
+            key=lambda slot: slot + 1 - bisect_right(holes, slot),
+        )
+
+    def _compact(self) -> None:
+        """Уплотнение списка: сдвиг записей после первого пропуска на место
+        удалённых; в индексе переносятся только позиции сдвинутых записей"""
+        first = self._holes[0]
+        goods_list = self._goods_list
+        moved = [
+            (slot, goods)
+            for slot, goods in enumerate(goods_list[first : self._used], first)
+            if goods is not None
+        ]
+        if self._metrics is not None:
+            self._metrics.count("compactions", self)
+            self._metrics.count("shifted_lines", self, len(moved))
+        live = [goods for _, goods in moved]
+        goods_list[first : self._used] = live + [None] * len(self._holes)
+        for new_slot, (old_slot, goods) in enumerate(moved, first):
+            self._index_move(goods.get_code(), old_slot, new_slot)
+        self._used -= len(self._holes)
+        self._holes = []
+
+    def _mark_removed(self, code: int) -> bool:
+        """Пометка первой записи с кодом как удалённой без уплотнения"""
+        slot = self._first_slot(code)
+        if slot is None:
+            return False
+        removed = self._goods_list[slot]
+        self._goods_list[slot] = None
+        self._index_discard(code, slot)
+        self._count -= 1
+        insort(self._holes, slot)
+        # Проверка на None для mypy
+        if removed is not None:
+            self._detach_goods(removed)
+            self._account(removed, -1)
+        return True
+
+    def _on_code_changed(self, goods: BaseGoods, old_code: int, new_code: int) -> None:
+        """Перенос позиций товара в индексе после изменения его кода"""
+        for slot in list(self._slots_of(old_code)):
+            if self._goods_list[slot] is goods:
+                self._index_discard(old_code, slot)
+                self._index_add(new_code, slot)
+
+    def add_goods(self, goods: BaseGoods) -> bool:
         """Добавление записи о покупаемом товаре"""
         if self._count >= self._size:
+            if self._metrics is not None:
+                self._metrics.count("size_cap_hits", self)
             return False  # Достигнут максимальный размер
 
+        goods_list = self._goods_list
+        if self._used >= len(goods_list):
+            if self._holes:
+                self._compact()
+            else:
+                self._grow()
+
+        slot = self._used
         # Проверка на None для mypy
-        if self._goods_list[self._count] is None:
-            self._goods_list[self._count] = goods
+        if goods_list[slot] is None:
+            # Регистрация первой: товар может отказаться входить в чек
+            self._attach_goods(goods)
+            goods_list[slot] = goods
+            code = goods._code
+            if code in self._index:
+                self._index_add(code, slot)
+            else:
+                self._index[code] = slot
+            self._used = slot + 1
             self._count += 1
+            self._account(goods, 1)
+            if self._metrics is not None:
+                self._metrics.count("add_goods", self)
             return True
         return False
 
-    def update_goods(self, goods: Goods) -> bool:
+    def update_goods(self, goods: BaseGoods) -> bool:
         """Изменение записи о покупаемом товаре"""
-        for i in range(self._count):
-            current_goods = self._goods_list[i]
-            # Проверка на None для mypy
-            if (
-                current_goods is not None
-                and current_goods.get_code() == goods.get_code()
-            ):
-                self._goods_list[i] = goods
-                return True
-        return False
+        slot = self._first_slot(goods.get_code())
+        if slot is None:
+            return False
+        self._attach_goods(goods)
+        current_goods = self._goods_list[slot]
+        # Проверка на None для mypy
+        if current_goods is not None:
+            self._detach_goods(current_goods)
+            self._account(current_goods, -1)
+        self._goods_list[slot] = goods
+        self._account(goods, 1)
+        return True
 
     def remove_goods(self, code: int) -> bool:
-        """Удаление записи о покупаемом товаре по коду"""
-        for i in range(self._count):
-            current_goods = self._goods_list[i]
-            # Проверка на None для mypy
-            if current_goods is not None and current_goods.get_code() == code:
-                # Сдвигаем элементы
-                for j in range(i, self._count - 1):
-                    self._goods_list[j] = self._goods_list[j + 1]
-                self._goods_list[self._count - 1] = None
-                self._count -= 1
-                return True
-        return False
+        """Удаление записи о покупаемом товаре по коду.
 
-    def find_goods_by_code(self, code: int) -> Optional[Goods]:
-        for i in range(self._count):
-            current_goods = self._goods_list[i]
-            # Проверка на None для mypy
-            if current_goods is not None and current_goods.get_code() == code:
-                return current_goods
-        return None
+        Позиция помечается удалённой; список уплотняется, когда удалённых
+        становится больше половины. Обращение по индексу уплотнения не
+        требует."""
+        if not self._mark_removed(code):
+            return False
+        if self._metrics is not None:
+            self._metrics.count("remove_goods", self)
+        if len(self._holes) * 2 > self._used:
+            self._compact()
+        return True
+
+    def remove_many(self, codes: Iterable[int]) -> int:
+        """Удаление по одной записи на каждый код с единственным уплотнением.
+        Возвращает число удалённых записей"""
+        removed = 0
+        for code in codes:
+            if self._mark_removed(code):
+                removed += 1
+        if removed and self._metrics is not None:
+            self._metrics.count("remove_goods", self, removed)
+        if self._holes:
+            self._compact()
+        return removed
+
+    def find_goods_by_code(self, code: int) -> Optional[BaseGoods]:
+        if self._metrics is not None:
+            return self._timed_find(self._metrics, code)
+        slot = self._first_slot(code)
+        if slot is None:
+            return None
+        return self._goods_list[slot]
+
+    def _has_code(self, code: int) -> bool:
+        """Есть ли в чеке записи с кодом"""
+        return code in self._index
+
+    def _goods_with_code(self, code: int) -> list[BaseGoods]:
+        """Все записи с кодом в порядке позиций"""
+        found = [self._goods_list[slot] for slot in self._slots_of(code)]
+        return [goods for goods in found if goods is not None]
+
+    def _timed_find(self, metrics: ReceiptMetrics, code: int) -> Optional[BaseGoods]:
+        start = perf_counter()
+        slot = self._first_slot(code)
+        goods = self._goods_list[slot] if slot is not None else None
+        metrics.observe("find_goods_by_code", self, perf_counter() - start)
+        return goods
+
+    def _first_by_code(self) -> dict[int, BaseGoods]:
+        """Первая запись для каждого кода (как у find_goods_by_code)"""
+        first: dict[int, BaseGoods] = {}
+        for goods in self:
+            first.setdefault(goods.get_code(), goods)
+        return first
+
+    def merge(self, other: "Receipt") -> list[BaseGoods]:
+        """Добавление записей другого чека с объединением количеств по коду.
+
+        Первая запись с уже имеющимся кодом заменяется копией с суммой
+        количеств, остальные записи добавляются копиями: объекты товаров,
+        которые могут входить и в другие чеки (в том числе в other), не
+        изменяются. Возвращает записи, не поместившиеся из-за ограничения
+        size."""
+        return self._merge_lines(list(other))
+
+    def _merge_lines(self, lines: list[BaseGoods]) -> list[BaseGoods]:
+        rejected = []
+        for goods in lines:
+            existing = self.find_goods_by_code(goods.get_code())
+            if existing is not None:
+                merged = existing.copy()
+                merged.set_quantity(existing.get_quantity() + goods.get_quantity())
+                self.update_goods(merged)
+            elif not self.add_goods(goods.copy()):
+                rejected.append(goods)
+        return rejected
+
+    def diff(self, other: "Receipt") -> ReceiptDiff:
+        """Различия с другим чеком по кодам (первая запись для каждого кода):
+        added - есть только в other, removed - только в self,
+        changed - пары (запись self, запись other) с разными полями"""
+        mine = self._first_by_code()
+        theirs = other._first_by_code()
+        added = [goods for code, goods in theirs.items() if code not in mine]
+        removed = [goods for code, goods in mine.items() if code not in theirs]
+        changed = [
+            (goods, theirs[code])
+            for code, goods in mine.items()
+            if code in theirs and not goods.same_as(theirs[code])
+        ]
+        return ReceiptDiff(added, removed, changed)
+
+    @staticmethod
+    def reconcile(
+        left: Iterable["Receipt"], right: Iterable["Receipt"]
+    ) -> dict[int, ReceiptDiff]:
+        """Сверка двух наборов чеков по номерам: непустые различия для
+        каждого номера. Чек, отсутствующий в одном из наборов, сравнивается
+        с пустым чеком"""
+        left_by_number = {receipt.get_receipt_number(): receipt for receipt in left}
+        right_by_number = {receipt.get_receipt_number(): receipt for receipt in right}
+        result = {}
+        for number in left_by_number.keys() | right_by_number.keys():
+            empty = Receipt(number, 0)
+            mine = left_by_number.get(number, empty)
+            theirs = right_by_number.get(number, empty)
+            difference = mine.diff(theirs)
+            if difference:
+                result[number] = difference
+        return result
 
     def get_total_sum(self) -> float:
-        total = 0.0
-        for i in range(self._count):
-            current_goods = self._goods_list[i]
-            # Проверка на None для mypy
-            if current_goods is not None:
-                total += current_goods.get_total()
-        return total
-
-    def __getitem__(self, index: int) -> Goods:
+        return self._total_sum + self._total_error
+
+    def __getitem__(self, index: int) -> BaseGoods:
         if index < 0 or index >= self._count:
             raise IndexError(f"Index {index} out of range [0, {self._count-1}]")
 
-        goods = self._goods_list[index]
+        goods = self._goods_list[self._slot(index)]
         # Проверка на None для mypy
         if goods is None:
             raise ValueError(f"Goods at index {index} is None")
         return goods
 
-    def __setitem__(self, index: int, value: Goods) -> None:
+    def __setitem__(self, index: int, value: BaseGoods) -> None:
         if index < 0 or index >= self._count:
             raise IndexError(f"Index {index} out of range [0, {self._count-1}]")
-        self._goods_list[index] = value
+        slot = self._slot(index)
+        self._attach_goods(value)
+        old = self._goods_list[slot]
+        if old is not None:
+            self._index_discard(old.get_code(), slot)
+            self._detach_goods(old)
+            self._account(old, -1)
+        self._goods_list[slot] = value
+        self._index_add(value.get_code(), slot)
+        self._account(value, 1)
 
     def __len__(self) -> int:
         return self._count
 
+    def __iter__(self) -> Iterator[BaseGoods]:
+        """Обход записей по порядку с пропуском удалённых позиций"""
+        for i in range(self._used):
+            goods = self._goods_list[i]
+            if goods is not None:
+                yield goods
+
     def __str__(self) -> str:
         result = [f"Товарный чек №{self._receipt_number}"]
         result.append(f"Дата: {self._date_time.strftime('%Y-%m-%d %H:%M:%S')}")
         result.append(f"Товаров: {self._count}/{self._size}")
         result.append("Список товаров:")
 
-        for i in range(self._count):
-            goods = self._goods_list[i]
-            # Проверка на None для mypy
-            if goods is not None:
-                result.append(f"  {i+1}. {goods}")
+        for i, goods in enumerate(self):
+            result.append(f"  {i+1}. {goods}")
+
+        result.append(f"Общая сумма: {self.get_total_sum():.2f}")
+        return "\n".join(result)
+
+
+class ConcurrentReceipt(Receipt):
+    """Товарный чек, безопасный для одновременной работы многих потоков.
+
+    Все изменения и чтения, зависящие от индекса или порядка строк,
+    выполняются под одной блокировкой. Благодаря индексу по коду и
+    отложенному уплотнению каждая операция держит блокировку O(1) времени,
+    поэтому ожидание потоков невелико. Итоги читаются согласованно через
+    snapshot().
+
+    Под своей блокировкой чек не вызывает обработчики других чеков:
+    обработчики изменений товара берут блокировку своего чека, и встречные
+    вызовы двух чеков заблокировали бы друг друга."""
+
+    # Регистрация владельцев изменяет сам товар, который может входить в
+    # несколько чеков, поэтому блокировка общая для всех чеков
+    _owners_lock = Lock()
+
+    def __init__(self, receipt_number: int, size: int = Receipt.MAX_SIZE) -> None:
+        super().__init__(receipt_number, size)
+        self._lock = RLock()
+
+    def _attach_goods(self, goods: BaseGoods) -> None:
+        with self._owners_lock:
+            goods._attach(self)
+
+    def _detach_goods(self, goods: BaseGoods) -> None:
+        with self._owners_lock:
+            goods._detach(self)
+
+    def snapshot(self) -> tuple[int, float, int]:
+        """Согласованные (число строк, общая сумма, общее количество)"""
+        with self._lock:
+            return self._count, super().get_total_sum(), self._total_quantity
+
+    def get_total_sum(self) -> float:
+        with self._lock:
+            return super().get_total_sum()
+
+    def _on_amount_changed(
+        self, goods: BaseGoods, old_price: Any, old_quantity: int
+    ) -> None:
+        with self._lock:
+            super()._on_amount_changed(goods, old_price, old_quantity)
+
+    def _on_code_changed(self, goods: BaseGoods, old_code: int, new_code: int) -> None:
+        with self._lock:
+            super()._on_code_changed(goods, old_code, new_code)
+
+    def add_goods(self, goods: BaseGoods) -> bool:
+        with self._lock:
+            return super().add_goods(goods)
+
+    def update_goods(self, goods: BaseGoods) -> bool:
+        with self._lock:
+            return super().update_goods(goods)
+
+    def remove_goods(self, code: int) -> bool:
+        with self._lock:
+            return super().remove_goods(code)
+
+    def remove_many(self, codes: Iterable[int]) -> int:
+        with self._lock:
+            return super().remove_many(codes)
+
+    def find_goods_by_code(self, code: int) -> Optional[BaseGoods]:
+        with self._lock:
+            return super().find_goods_by_code(code)
+
+    def merge(self, other: Receipt) -> list[BaseGoods]:
+        # Поиск кода и добавление копии выполняются под одной блокировкой,
+        # иначе параллельные merge добавляют одну строку несколько раз.
+        # Снимок other берётся до неё, чтобы встречные merge не
+        # заблокировали друг друга
+        lines = list(other)
+        with self._lock:
+            return self._merge_lines(lines)
+
+    def __getitem__(self, index: int) -> BaseGoods:
+        with self._lock:
+            return super().__getitem__(index)
+
+    def __setitem__(self, index: int, value: BaseGoods) -> None:
+        with self._lock:
+            super().__setitem__(index, value)
+
+    def __iter__(self) -> Iterator[BaseGoods]:
+        """Обход снимка строк, сделанного под блокировкой"""
+        with self._lock:
+            goods_list = list(super().__iter__())
+        return iter(goods_list)
+
+    def __str__(self) -> str:
+        with self._lock:
+            return super().__str__()
+
+
+class FixedPointReceipt(Receipt):
+    """Товарный чек с точной суммой в целых копейках.
+
+    Итог накапливается целочисленно по get_total_cents() строк, поэтому
+    не накапливает погрешность при любом числе изменений. Точнее всего
+    работает с FixedPointGoods; цены Goods округляются до копеек."""
+
+    _goods_class = FixedPointGoods
+
+    def __init__(self, receipt_number: int, size: int = Receipt.MAX_SIZE) -> None:
+        super().__init__(receipt_number, size)
+        self._total_cents = 0
+
+    def get_total_cents(self) -> int:
+        return self._total_cents
+
+    def get_total_sum(self) -> float:
+        return self._total_cents / MINOR_UNITS
+
+    def _account(self, goods: BaseGoods, sign: int) -> None:
+        self._total_cents += sign * goods.get_total_cents()
+        self._total_quantity += sign * goods.get_quantity()
+
+    def _on_amount_changed(
+        self, goods: BaseGoods, old_price: Any, old_quantity: int
+    ) -> None:
+        self._total_cents += goods.get_total_cents() - goods._line_total_cents(
+            old_price, old_quantity
+        )
+        self._total_quantity += goods.get_quantity() - old_quantity
+
+    @staticmethod
+    def sum_cents(receipts: Iterable["FixedPointReceipt"]) -> int:
+        """Точная целочисленная сумма по набору чеков"""
+        return sum(receipt._total_cents for receipt in receipts)
+
+
+class SortedReceipt(Receipt):
+    """Товарный чек с упорядоченными индексами по цене и стоимости строки.
+
+    Индексы - отсортированные списки (ключ, порядковый номер, товар),
+    обновляемые при каждом изменении чека, поэтому выборки "самые дорогие",
+    "цена в диапазоне" и "первые N по стоимости" выполняются двоичным
+    поиском за O(log n + k) без сортировки копии списка."""
+
+    def __init__(self, receipt_number: int, size: int = Receipt.MAX_SIZE) -> None:
+        super().__init__(receipt_number, size)
+        self._by_price: list[tuple[float, int, BaseGoods]] = []
+        self._by_total: list[tuple[float, int, BaseGoods]] = []
+        # id(товара) -> ключи его вхождений (цена, стоимость, порядковый номер)
+        self._entries: dict[int, list[tuple[float, float, int]]] = {}
+        self._sequence = 0
+
+    def _insert_keys(self, goods: BaseGoods, sequence: int) -> tuple[float, float, int]:
+        price, total = goods.get_price(), goods.get_total()
+        insort(self._by_price, (price, sequence, goods))
+        insort(self._by_total, (total, sequence, goods))
+        return price, total, sequence
+
+    def _remove_keys(self, price: float, total: float, sequence: int) -> None:
+        del self._by_price[bisect_left(self._by_price, (price, sequence))]
+        del self._by_total[bisect_left(self._by_total, (total, sequence))]
+
+    def _account(self, goods: BaseGoods, sign: int) -> None:
+        super()._account(goods, sign)
+        if sign > 0:
+            self._sequence += 1
+            keys = self._insert_keys(goods, self._sequence)
+            self._entries.setdefault(id(goods), []).append(keys)
+        else:
+            entries = self._entries[id(goods)]
+            self._remove_keys(*entries.pop())
+            if not entries:
+                del self._entries[id(goods)]
+
+    def _on_amount_changed(
+        self, goods: BaseGoods, old_price: Any, old_quantity: int
+    ) -> None:
+        super()._on_amount_changed(goods, old_price, old_quantity)
+        entries = self._entries[id(goods)]
+        for i, (price, total, sequence) in enumerate(entries):
+            self._remove_keys(price, total, sequence)
+            entries[i] = self._insert_keys(goods, sequence)
+
+    def most_expensive(self, n: int) -> list[BaseGoods]:
+        """n строк с наибольшей ценой, по убыванию цены"""
+        return [goods for _, _, goods in reversed(self._by_price[-n:])] if n > 0 else []
+
+    def top_by_total(self, n: int) -> list[BaseGoods]:
+        """n строк с наибольшей стоимостью, по убыванию стоимости"""
+        return [goods for _, _, goods in reversed(self._by_total[-n:])] if n > 0 else []
+
+    def price_range(self, low: float, high: float) -> list[BaseGoods]:
+        """Строки с ценой в диапазоне [low, high] по возрастанию цены"""
+        start = bisect_left(self._by_price, (low,))
+        end = bisect_left(self._by_price, (high, math.inf), start)
+        return [goods for _, _, goods in self._by_price[start:end]]
+
+    def _descending(self, by: str) -> Iterator[tuple[float, int, BaseGoods]]:
+        """Ключи строк по убыванию в виде (-ключ, номер чека, товар)"""
+        number = self._receipt_number
+        for key, _, goods in reversed(
+            self._by_price if by == "price" else self._by_total
+        ):
+            yield -key, number, goods
+
+    @staticmethod
+    def top_across(
+        receipts: Iterable["SortedReceipt"], n: int, by: str = "total"
+    ) -> list[tuple[int, BaseGoods]]:
+        """n строк с наибольшей стоимостью (by="total") или ценой (by="price")
+        по набору чеков: пары (номер чека, товар) по убыванию ключа.
+        Упорядоченные индексы чеков сливаются кучей, поэтому просматривается
+        не более n строк сверх числа чеков."""
+        if by not in ("price", "total"):
+            raise ValueError('Упорядочение возможно только по "price" или "total"')
+        streams = [receipt._descending(by) for receipt in receipts]
+        merged = heapq.merge(*streams, key=lambda entry: entry[:2])
+        return [(number, goods) for _, number, goods in islice(merged, max(n, 0))]
+
+
+class _ColumnarGoodsView(Goods):
+    """Товар-представление строки столбцового чека.
+
+    Чтение и запись полей выполняются непосредственно в столбцы чека.
+    Представление действительно до удаления строк из чека."""
+
+    __slots__ = ("_receipt", "_row")
+
+    def __init__(self, receipt: "ColumnarReceipt", row: int) -> None:
+        self._receipt = receipt
+        self._row = row
+
+    @property
+    def _code(self) -> int:
+        return self._receipt._codes[self._row]
+
+    @_code.setter
+    def _code(self, value: int) -> None:
+        self._receipt._codes[self._row] = value
+
+    @property
+    def _name(self) -> str:
+        return self._receipt._name_table[self._receipt._name_ids[self._row]]
+
+    @_name.setter
+    def _name(self, value: str) -> None:
+        self._receipt._name_ids[self._row] = self._receipt._name_id(value)
+
+    @property
+    def _price(self) -> float:
+        return self._receipt._prices[self._row]
+
+    @_price.setter
+    def _price(self, value: float) -> None:
+        self._receipt._prices[self._row] = value
+
+    @property
+    def _quantity(self) -> int:
+        return self._receipt._quantities[self._row]
+
+    @_quantity.setter
+    def _quantity(self, value: int) -> None:
+        self._receipt._quantities[self._row] = value
+
+    @property
+    def _owners(self) -> _Owners:
+        return None
+
+    @_owners.setter
+    def _owners(self, value: _Owners) -> None:
+        """Строка столбцового чека не регистрирует чеки-владельцы"""
+
+    def _attach(self, receipt: "Receipt") -> None:
+        # Без регистрации итоги чека не следили бы за изменениями строки
+        raise TypeError(
+            "Строку столбцового чека нельзя добавить в другой чек, добавьте её копию"
+        )
+
+
+class ColumnarReceipt:
+    """Товарный чек со столбцовым хранением строк.
+
+    Коды, цены и количества хранятся в типизированных массивах array,
+    наименования - в отдельной таблице, строки ссылаются на неё по номеру.
+    Итоги и поиск выполняются проходом по массивам на уровне C.
+    Товар копируется в столбцы при добавлении, поэтому последующие
+    изменения исходного объекта Goods на чек не влияют."""
+
+    MAX_SIZE = Receipt.MAX_SIZE
+
+    def __init__(self, receipt_number: int, size: int = MAX_SIZE) -> None:
+        self._receipt_number = receipt_number
+        self._date_time = datetime.now()
+        self._size = size
+        self._codes = array("q")
+        self._prices = array("d")
+        self._quantities = array("q")
+        self._name_ids = array("i")
+        self._name_table: list[str] = []
+        self._name_lookup: dict[str, int] = {}
+
+    def size(self) -> int:
+        return self._size
+
+    def get_count(self) -> int:
+        """Возвращает текущее количество элементов"""
+        return len(self._codes)
+
+    def get_receipt_number(self) -> int:
+        return self._receipt_number
+
+    def get_date_time(self) -> datetime:
+        return self._date_time
+
+    def _name_id(self, name: str) -> int:
+        """Номер наименования в таблице (с добавлением нового)"""
+        name_id = self._name_lookup.get(name)
+        if name_id is None:
+            name_id = len(self._name_table)
+            self._name_table.append(name)
+            self._name_lookup[name] = name_id
+        return name_id
+
+    def _find_row(self, code: int) -> int:
+        try:
+            return self._codes.index(code)
+        except ValueError:
+            return -1
+
+    def _write_row(self, row: int, goods: BaseGoods) -> None:
+        self._codes[row] = goods.get_code()
+        self._name_ids[row] = self._name_id(goods.get_name())
+        self._prices[row] = goods.get_price()
+        self._quantities[row] = goods.get_quantity()
+
+    def add_goods(self, goods: BaseGoods) -> bool:
+        """Добавление записи о покупаемом товаре"""
+        if len(self._codes) >= self._size:
+            return False  # Достигнут максимальный размер
+        self._codes.append(goods.get_code())
+        self._name_ids.append(self._name_id(goods.get_name()))
+        self._prices.append(goods.get_price())
+        self._quantities.append(goods.get_quantity())
+        return True
+
+    def add_columns(self, columns: GoodsColumns) -> int:
+        """Добавление строк пакетного разбора в пределах size.
+        Возвращает число добавленных строк"""
+        free = max(0, self._size - len(self._codes))
+        added = min(free, len(columns))
+        self._codes.extend(columns.codes[:added])
+        self._name_ids.extend(map(self._name_id, columns.names[:added]))
+        self._prices.extend(columns.prices[:added])
+        self._quantities.extend(columns.quantities[:added])
+        return added
+
+    def update_goods(self, goods: BaseGoods) -> bool:
+        """Изменение записи о покупаемом товаре"""
+        row = self._find_row(goods.get_code())
+        if row < 0:
+            return False
+        self._write_row(row, goods)
+        return True
+
+    def remove_goods(self, code: int) -> bool:
+        """Удаление записи о покупаемом товаре по коду"""
+        row = self._find_row(code)
+        if row < 0:
+            return False
+        del self._codes[row]
+        del self._name_ids[row]
+        del self._prices[row]
+        del self._quantities[row]
+        return True
+
+    def find_goods_by_code(self, code: int) -> Optional[BaseGoods]:
+        row = self._find_row(code)
+        if row < 0:
+            return None
+        return _ColumnarGoodsView(self, row)
+
+    def get_total_sum(self) -> float:
+        return sum(map(mul, self._prices, self._quantities))
+
+    def get_total_quantity(self) -> int:
+        """Общее количество единиц товара в чеке"""
+        return sum(self._quantities)
+
+    def __getitem__(self, index: int) -> BaseGoods:
+        count = len(self._codes)
+        if index < 0 or index >= count:
+            raise IndexError(f"Index {index} out of range [0, {count-1}]")
+        return _ColumnarGoodsView(self, index)
+
+    def __setitem__(self, index: int, value: BaseGoods) -> None:
+        count = len(self._codes)
+        if index < 0 or index >= count:
+            raise IndexError(f"Index {index} out of range [0, {count-1}]")
+        self._write_row(index, value)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> Iterator[BaseGoods]:
+        for row in range(len(self._codes)):
+            yield _ColumnarGoodsView(self, row)
+
+    def __str__(self) -> str:
+        count = len(self._codes)
+        result = [f"Товарный чек №{self._receipt_number}"]
+        result.append(f"Дата: {self._date_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        result.append(f"Товаров: {count}/{self._size}")
+        result.append("Список товаров:")
+
+        for i in range(count):
+            result.append(f"  {i+1}. {_ColumnarGoodsView(self, i)}")
 
         result.append(f"Общая сумма: {self.get_total_sum():.2f}")
         return "\n".join(result)
@@ -1,5 +1,6 @@
 import math
 import os
+import random
 import sys
 from io import StringIO
 from unittest.mock import patch
@@ -7,7 +8,15 @@ from unittest.mock import patch
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-from task_package.zad1 import Pair  # noqa: E402
+from task_package.coords import (  # noqa: E402
+    MappedCoordinates,
+    load_binary,
+    load_pair_array,
+    read_pairs,
+    write_binary,
+)
+from task_package.spatial import KDTree, SpatialHash  # noqa: E402
+from task_package.zad1 import Pair, PairArray  # noqa: E402
 
 
 class TestPair:
@@ -30,6 +39,16 @@ class TestPair:
         with pytest.raises(ValueError, match="Введите дробное число Float"):
             Pair("invalid", "values")
 
+    def test_slots_and_operation_results(self):
+        pair = Pair(1, 2)
+        assert not hasattr(pair, "__dict__")
+        with pytest.raises(AttributeError):
+            pair.third = 3.0
+
+        results = [pair + pair, pair - pair, pair * 2, pair / 2]
+        assert all(type(result) is Pair for result in results)
+        assert all(type(c) is float for result in results for c in result)
+
     def test_str_representation(self):
         pair = Pair(1.5, 2.5)
         assert str(pair) == "(1.5, 2.5)"
@@ -259,3 +278,299 @@ class TestPairEdgeCases:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestPairArray:
+    def make_points(self):
+        return PairArray.from_pairs([Pair(3.0, 4.0), Pair(1.0, 2.0), Pair(-6.0, 8.0)])
+
+    def test_conversion(self):
+        points = self.make_points()
+
+        assert len(points) == 3
+        assert points.first.typecode == "d"
+        assert points.to_pairs() == [Pair(3.0, 4.0), Pair(1.0, 2.0), Pair(-6.0, 8.0)]
+        assert list(points) == points.to_pairs()
+        assert points[1] == Pair(1.0, 2.0)
+        assert points[1:] == PairArray([1.0, -6.0], [2.0, 8.0])
+
+    def test_invalid_columns(self):
+        with pytest.raises(ValueError, match="Введите дробное число Float"):
+            PairArray(["invalid"], [1.0])
+        with pytest.raises(ValueError, match="одной длины"):
+            PairArray([1.0, 2.0], [1.0])
+
+    def test_elementwise_operations(self):
+        points = self.make_points()
+        other = PairArray([1.0, 1.0, 1.0], [2.0, 2.0, 2.0])
+
+        assert points + other == PairArray([4.0, 2.0, -5.0], [6.0, 4.0, 10.0])
+        assert points - Pair(1.0, 2.0) == PairArray([2.0, 0.0, -7.0], [2.0, 0.0, 6.0])
+        assert (
+            2 * points == points * 2.0 == PairArray([6.0, 2.0, -12.0], [8.0, 4.0, 16.0])
+        )
+        assert points * other == PairArray([3.0, 1.0, -6.0], [8.0, 4.0, 16.0])
+        assert points / 2 == PairArray([1.5, 0.5, -3.0], [2.0, 1.0, 4.0])
+        assert (points + Pair(1.0, 1.0)).to_pairs() == [
+            p + Pair(1.0, 1.0) for p in points
+        ]
+
+    def test_point_on_the_left(self):
+        points = self.make_points()
+
+        assert Pair(1.0, 2.0) + points == points + Pair(1.0, 2.0)
+        assert Pair(1.0, 2.0) - points == PairArray([-2.0, 0.0, 7.0], [-2.0, 0.0, -6.0])
+        assert (Pair(1.0, 2.0) - points).to_pairs() == [
+            Pair(1.0, 2.0) - p for p in points
+        ]
+        with pytest.raises(TypeError, match="Можно складывать только объекты Pair"):
+            Pair(1.0, 2.0) + "string"
+
+    def test_inplace_operations(self):
+        points = self.make_points()
+        points += Pair(1.0, 1.0)
+        points *= 2
+        points -= PairArray([8.0, 4.0, -10.0], [10.0, 6.0, 18.0])
+        points /= 0.5
+
+        assert points == PairArray([0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+
+    def test_norms(self):
+        points = self.make_points()
+
+        assert list(abs(points)) == [5.0, math.hypot(1.0, 2.0), 10.0]
+        assert list(points.distance()) == [abs(p) for p in points]
+        assert list(points.distance_to(Pair(3.0, 4.0))) == [
+            0.0,
+            math.hypot(2.0, 2.0),
+            9.848857801796104,
+        ]
+
+    def test_invalid_operands(self):
+        points = self.make_points()
+        with pytest.raises(
+            TypeError, match="Можно складывать только объекты Pair или PairArray"
+        ):
+            points + 1.0
+        with pytest.raises(
+            TypeError, match="Можно умножать только на число или PairArray"
+        ):
+            points * "invalid"
+        with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+            points / 0
+        with pytest.raises(ValueError, match="одной длины"):
+            points + points[:2]
+
+
+class TestKDTree:
+    def make_points(self, count=500, seed=7):
+        rng = random.Random(seed)
+        # Целочисленная сетка даёт много равных расстояний
+        return [
+            Pair(
+                rng.randint(-20, 20),
+                rng.uniform(-20.0, 20.0) if i % 2 else rng.randint(-20, 20),
+            )
+            for i in range(count)
+        ]
+
+    def brute_nearest(self, points, query, k):
+        ranked = sorted(
+            ((p.first - query.first) ** 2 + (p.second - query.second) ** 2, i)
+            for i, p in enumerate(points)
+        )
+        return [(math.sqrt(d2), i) for d2, i in ranked[:k]]
+
+    def brute_within(self, points, query, radius):
+        return [
+            i
+            for i, p in enumerate(points)
+            if (p.first - query.first) ** 2 + (p.second - query.second) ** 2
+            <= radius * radius
+        ]
+
+    def test_matches_brute_force(self):
+        points = self.make_points()
+        rng = random.Random(11)
+        queries = [
+            Pair(rng.uniform(-25.0, 25.0), rng.randint(-25, 25)) for _ in range(60)
+        ]
+        for leaf_size in (1, 4, 16):
+            tree = KDTree(points, leaf_size)
+            assert len(tree) == len(points)
+            for query in queries:
+                for k in (1, 5, 40):
+                    assert tree.nearest(query, k) == self.brute_nearest(
+                        points, query, k
+                    )
+                for radius in (0.0, 3.0, 10.0):
+                    assert tree.within(query, radius) == self.brute_within(
+                        points, query, radius
+                    )
+
+    def test_batched_queries_and_pair_array(self):
+        points = self.make_points(200)
+        tree = KDTree(PairArray.from_pairs(points))
+        queries = PairArray([0.0, 5.5, -19.0], [0.0, -3.0, 20.0])
+
+        assert tree.nearest_many(queries, 3) == [
+            self.brute_nearest(points, q, 3) for q in queries
+        ]
+        assert tree.within_many(queries, 4.0) == [
+            self.brute_within(points, q, 4.0) for q in queries
+        ]
+
+    def test_edge_cases(self):
+        empty = KDTree([])
+        assert empty.nearest(Pair(1, 1), 3) == []
+        assert empty.within(Pair(1, 1), 5.0) == []
+
+        tree = KDTree([Pair(1, 1), Pair(2, 2)])
+        assert tree.nearest(Pair(0, 0), 0) == []
+        assert [i for _, i in tree.nearest(Pair(0, 0), 10)] == [0, 1]
+        with pytest.raises(ValueError):
+            tree.within(Pair(0, 0), -1.0)
+        with pytest.raises(ValueError):
+            KDTree([Pair(1, 1)], leaf_size=0)
+
+
+class TestSpatialHash:
+    def make_grid(self, count=300, seed=3):
+        rng = random.Random(seed)
+        points = [
+            Pair(rng.uniform(-50.0, 50.0), rng.uniform(-50.0, 50.0))
+            for _ in range(count)
+        ]
+        grid = SpatialHash(5.0)
+        for point in points:
+            grid.insert(point)
+        return grid, points
+
+    def test_candidate_pairs_cover_close_points(self):
+        grid, points = self.make_grid()
+        candidates = [frozenset((id(a), id(b))) for a, b in grid.candidate_pairs()]
+
+        assert len(candidates) == len(set(candidates))
+        close = {
+            frozenset((id(a), id(b)))
+            for i, a in enumerate(points)
+            for b in points[i + 1 :]
+            if abs(a - b) <= grid.get_cell_size()
+        }
+        assert close <= set(candidates)
+
+    def test_queries(self):
+        grid, points = self.make_grid()
+        low, high = Pair(-12.5, 3.0), Pair(20.0, 31.0)
+
+        box = grid.query_box(low, high)
+        expected = [
+            p for p in points if -12.5 <= p.first <= 20.0 and 3.0 <= p.second <= 31.0
+        ]
+        assert sorted(map(id, box)) == sorted(map(id, expected))
+        assert sorted(
+            map(id, grid.query_box(Pair(-1e9, -1e9), Pair(1e9, 1e9)))
+        ) == sorted(map(id, points))
+
+        center = points[0]
+        near = grid.neighbours(center)
+        assert center not in near
+        assert all(
+            p in near for p in points[1:] if abs(p - center) <= grid.get_cell_size()
+        )
+
+    def test_incremental_updates(self):
+        grid, points = self.make_grid(50)
+        point = points[0]
+        grid.move(point, Pair(100.0, 0.0))
+        assert grid.cell_of(point) == (
+            math.floor(point.first / 5.0),
+            math.floor(point.second / 5.0),
+        )
+        assert point in grid.query_box(Pair(45.0, -60.0), Pair(160.0, 60.0))
+
+        for other in points[1:11]:
+            other += Pair(-200.0, 0.0)
+        assert grid.refresh() == 10
+        assert len(grid.query_box(Pair(-300.0, -60.0), Pair(-140.0, 60.0))) == 10
+
+        grid.remove(point)
+        assert point not in grid
+        assert len(grid) == 49 == len(list(grid))
+        with pytest.raises(KeyError):
+            grid.remove(point)
+        with pytest.raises(ValueError):
+            grid.insert(points[1])
+        with pytest.raises(ValueError):
+            SpatialHash(0)
+
+
+class TestCoordinateReaders:
+    def test_text_formats(self, tmp_path):
+        path = tmp_path / "points.csv"
+        path.write_text("# x,y\n1.5,2.5\n\n-3, 4e1\n7\t8\n", encoding="utf-8")
+
+        pairs = read_pairs(path)
+        assert iter(pairs) is pairs
+        assert list(pairs) == [Pair(1.5, 2.5), Pair(-3, 40), Pair(7, 8)]
+        assert load_pair_array(path) == PairArray([1.5, -3.0, 7.0], [2.5, 40.0, 8.0])
+        assert list(read_pairs(StringIO("1;2\n3;4\n"), delimiter=";")) == [
+            Pair(1, 2),
+            Pair(3, 4),
+        ]
+
+    def test_text_errors(self):
+        with pytest.raises(ValueError, match="Строка 2"):
+            list(read_pairs(["1,2", "1,2,3"]))
+        with pytest.raises(ValueError, match="Строка 1"):
+            load_pair_array(["x y"])
+
+    def test_binary_roundtrip(self, tmp_path):
+        path = tmp_path / "points.bin"
+        points = PairArray([0.1, -2.0, 1e300], [3.5, 0.0, -7.25])
+        write_binary(path, points.to_pairs())
+
+        assert path.stat().st_size == 48
+        assert load_binary(path) == points
+        with MappedCoordinates(path) as mapped:
+            assert len(mapped) == 3
+            assert mapped[1] == Pair(-2.0, 0.0)
+            assert mapped[-1] == Pair(1e300, -7.25)
+            assert list(mapped) == points.to_pairs()
+            assert mapped.to_pair_array() == points
+            with pytest.raises(IndexError):
+                mapped[3]
+
+    def test_close_with_live_iterator_and_view(self, tmp_path):
+        path = tmp_path / "points.bin"
+        write_binary(path, [Pair(i, -i) for i in range(10_000)])
+        with MappedCoordinates(path) as mapped:
+            for point in mapped:
+                break
+            view = mapped.get_view()
+            part = view[2:4]
+        assert point == Pair(0.0, 0.0)
+        assert list(part) == [1.0, -1.0]
+        for operation in (len, list, MappedCoordinates.get_view, lambda m: m[0]):
+            with pytest.raises(ValueError, match="закрыт"):
+                operation(mapped)
+        mapped.close()
+
+        with MappedCoordinates(path) as mapped:
+            assert sum(1 for _ in mapped) == 10_000
+            assert list(mapped)[-1] == Pair(9999.0, -9999.0)
+
+    def test_binary_edge_cases(self, tmp_path):
+        empty = tmp_path / "empty.bin"
+        write_binary(empty, [])
+        with MappedCoordinates(empty) as mapped:
+            assert len(mapped) == 0
+            assert list(mapped) == []
+            assert len(mapped.to_pair_array()) == 0
+
+        broken = tmp_path / "broken.bin"
+        broken.write_bytes(b"\0" * 20)
+        with pytest.raises(ValueError, match="16"):
+            load_binary(broken)
+        with pytest.raises(ValueError, match="16"):
+            MappedCoordinates(broken)
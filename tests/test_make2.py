@@ -1,11 +1,35 @@
+import asyncio
+import gc
+import math
 import os
 import sys
-from datetime import datetime
+import threading
+import weakref
+from datetime import datetime, timedelta
+from io import StringIO
 
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-from task_package.zad2 import Goods, Receipt  # noqa: E402
+from task_package.aggregation import aggregate_sales  # noqa: E402
+from task_package.archive import ReceiptArchive, append_receipts  # noqa: E402
+from task_package.catalog import _SWEEP_MIN, Catalog, CatalogGoods  # noqa: E402
+from task_package.ingest import IngestRejection, ReceiptIngestor  # noqa: E402
+from task_package.render import ReceiptRenderer  # noqa: E402
+from task_package.store import ReceiptStore  # noqa: E402
+from task_package.zad2 import (  # noqa: E402
+    ColumnarReceipt,
+    ConcurrentReceipt,
+    FixedPointGoods,
+    FixedPointReceipt,
+    Goods,
+    GoodsColumns,
+    GoodsParseError,
+    Receipt,
+    ReceiptMetrics,
+    SortedReceipt,
+    to_minor_units,
+)
 
 
 class TestGoods:
@@ -74,8 +98,91 @@ class TestGoods:
         assert "Количество: 10" in result
         assert "Сумма: 25.0" in result
 
+    def test_from_lines_reports_errors(self):
+        lines = [
+            "100,Яблоки,2.5,10\n",
+            "плохая строка\n",
+            "\n",
+            "200,Бананы,x,15\n",
+            "300,Груши,2.8,12",
+        ]
+        errors: list[GoodsParseError] = []
+
+        goods = list(Goods.from_lines(lines, errors.append, batch_size=2))
+
+        assert [g.get_code() for g in goods] == [100, 300]
+        assert [e.line_number for e in errors] == [2, 4]
+        assert errors[1].line == "200,Бананы,x,15"
+
+    def test_from_lines_is_lazy(self):
+        def source():
+            yield "100,Яблоки,2.5,10"
+            raise AssertionError("источник прочитан дальше необходимого")
+
+        first = next(Goods.from_lines(source(), batch_size=1))
+        assert first.get_code() == 100
+
+    def test_compact_layout_and_shared_names(self):
+        goods1 = Goods("100,Яблоки,2.5,10")
+        goods2 = Goods("".join(["200,Ябл", "оки,1.8,15"]))
+
+        assert not hasattr(goods1, "__dict__")
+        assert goods1.get_name() is goods2.get_name()
+
+        goods2.set_name("".join(["Бана", "ны"]))
+        assert goods2.get_name() is Goods("300,Бананы,1.0,1").get_name()
+
+    def test_parse_batch_fast_path(self):
+        columns = Goods.parse_batch(
+            "100,Яблоки,2.5,10\r\n200,Бананы,1.8,15\n300,Яблоки, 3.2,8\n"
+        )
+
+        assert isinstance(columns, GoodsColumns)
+        assert len(columns) == 3
+        assert list(columns.codes) == [100, 200, 300]
+        assert list(columns.prices) == [2.5, 1.8, 3.2]
+        assert list(columns.quantities) == [10, 15, 8]
+        assert columns.names[0] is columns.names[2]
+        assert columns.errors == []
+
+    def test_parse_batch_reports_error_positions(self):
+        block = "100,Яблоки,2.5,10\n200,Бананы,x,15\n\n300,Груши\n400,Сливы,1.0,99999999999999999999\n500,Дыни,4.0,1".encode()
+
+        columns = Goods.parse_batch(block, first_line_number=10)
+
+        assert list(columns.codes) == [100, 500]
+        assert [e.line_number for e in columns.errors] == [11, 13, 14]
+        goods = columns.to_goods()
+        assert [str(g) for g in goods] == [
+            str(Goods("100,Яблоки,2.5,10")),
+            str(Goods("500,Дыни,4.0,1")),
+        ]
+
+    def test_parse_batch_empty(self):
+        assert len(Goods.parse_batch("")) == 0
+
 
 class TestReceipt:
+    def test_goods_do_not_keep_receipts_alive(self):
+        goods = Goods("100,Яблоки,2.5,10")
+        receipts = [Receipt(n) for n in range(1000)]
+        for receipt in receipts:
+            receipt.add_goods(goods)
+        twice = Receipt(1000)
+        twice.add_goods(goods)
+        twice.add_goods(goods)
+        goods.set_quantity(2)
+        assert receipts[0].get_total_sum() == 5.0
+        assert twice.get_total_sum() == 10.0
+
+        refs = [weakref.ref(receipt) for receipt in receipts + [twice]]
+        del receipts, receipt, twice
+        gc.collect()
+
+        assert all(ref() is None for ref in refs)
+        goods.set_price(3.0)
+        assert goods._receipts() == []
+
     def test_initialization(self):
         receipt = Receipt(12345)
 
@@ -186,6 +293,31 @@ class TestReceipt:
         expected_total = 25.0 + 27.0 + 25.6
         assert abs(total - expected_total) < 0.001
 
+    def test_total_sum_does_not_depend_on_history(self):
+        receipt = Receipt(1)
+        goods = [
+            Goods(f"{code},Товар,{price},1")
+            for code, price in ((1, 0.1), (2, 0.2), (3, 0.3))
+        ]
+        for item in goods:
+            receipt.add_goods(item)
+        receipt.remove_goods(1)
+        assert receipt.get_total_sum() == 0.5
+
+        goods[1].set_price(1.0)
+        assert receipt.get_total_sum() == 1.3
+
+        for i in range(50):
+            receipt.add_goods(Goods(f"{100 + i},Товар,{i / 7 + 0.01},{i % 5 + 1}"))
+        receipt.remove_many(range(100, 150, 3))
+        for item in list(receipt)[::4]:
+            item.set_quantity(item.get_quantity() + 3)
+            item.set_price(item.get_price() * 1.1)
+        receipt[2] = Goods("999,Товар,0.7,3")
+        assert receipt.get_total_sum() == math.fsum(
+            item.get_total() for item in receipt
+        )
+
     def test_get_total_sum_empty_receipt(self):
         receipt = Receipt(12345)
         assert receipt.get_total_sum() == 0.0
@@ -254,6 +386,1057 @@ class TestReceipt:
         assert "Товаров: 0/100" in result
         assert "Общая сумма: 0.00" in result
 
+    def test_index_after_remove_shift(self):
+        receipt = Receipt(12345)
+        for i in range(5):
+            receipt.add_goods(Goods(f"{i+100},Товар{i},1.0,1"))
+
+        assert receipt.remove_goods(101) is True
+        assert receipt.find_goods_by_code(104) is receipt[3]
+        assert receipt.remove_goods(104) is True
+        assert receipt.find_goods_by_code(104) is None
+        assert [receipt[i].get_code() for i in range(len(receipt))] == [100, 102, 103]
+
+    def test_index_after_setitem_and_set_code(self):
+        receipt = Receipt(12345)
+        receipt.add_goods(Goods("100,Яблоки,2.5,10"))
+        receipt.add_goods(Goods("200,Бананы,1.8,15"))
+
+        receipt[0] = Goods("300,Груши,2.8,12")
+        assert receipt.find_goods_by_code(100) is None
+        assert receipt.find_goods_by_code(300) is receipt[0]
+
+        receipt[1].set_code(400)
+        assert receipt.find_goods_by_code(200) is None
+        assert receipt.find_goods_by_code(400) is receipt[1]
+
+    def test_index_keeps_single_slots_unwrapped(self):
+        receipt = Receipt(12345)
+        for line in ("100,А,1.0,1", "200,Б,1.0,1", "100,А,2.0,1", "300,В,1.0,1"):
+            receipt.add_goods(Goods(line))
+
+        assert receipt._index == {100: [0, 2], 200: 1, 300: 3}
+        assert receipt.find_goods_by_code(100) is receipt[0]
+        assert receipt.remove_goods(100) is True
+        assert receipt._index[100] == 2
+        assert receipt.find_goods_by_code(100) is receipt[1]
+
+        receipt[0].set_code(100)
+        assert receipt._index[100] == [1, 2]
+        receipt.remove_many([100, 300])
+        assert receipt._index == {100: 0}
+        assert [goods.get_price() for goods in receipt] == [2.0]
+
+    def test_running_totals(self):
+        receipt = Receipt(12345)
+        goods1 = Goods("100,Яблоки,2.5,10")
+        goods2 = Goods("200,Бананы,1.8,15")
+        receipt.add_goods(goods1)
+        receipt.add_goods(goods2)
+        assert receipt.get_total_quantity() == 25
+
+        goods1.set_price(3.0)
+        goods2.set_quantity(5)
+        assert receipt.get_total_sum() == 30.0 + 9.0
+        assert receipt.get_total_quantity() == 15
+
+        receipt[0] = Goods("300,Груши,2.0,2")
+        assert receipt.get_total_sum() == 4.0 + 9.0
+        goods1.set_price(100.0)  # товар уже не в чеке
+        assert receipt.get_total_sum() == 13.0
+
+        receipt.remove_goods(300)
+        receipt.remove_goods(200)
+        assert receipt.get_total_sum() == 0.0
+        assert receipt.get_total_quantity() == 0
+
+    def test_from_lines_rolls_over(self):
+        feed = StringIO("".join(f"{i},Товар{i},1.5,2\n" for i in range(7)) + "ошибка\n")
+        errors: list[GoodsParseError] = []
+
+        receipts = list(
+            Receipt.from_lines(feed, first_number=10, size=3, on_error=errors.append)
+        )
+
+        assert [r.get_receipt_number() for r in receipts] == [10, 11, 12]
+        assert [len(r) for r in receipts] == [3, 3, 1]
+        assert receipts[2][0].get_code() == 6
+        assert len(errors) == 1
+
+    def test_lazy_removal_keeps_dense_view(self):
+        receipt = Receipt(12345, 10)
+        for i in range(6):
+            receipt.add_goods(Goods(f"{i+100},Товар{i},1.0,1"))
+
+        assert receipt.remove_goods(100) is True
+        assert receipt._holes == [0]
+        assert len(receipt) == 5
+        assert [g.get_code() for g in receipt] == [101, 102, 103, 104, 105]
+        assert "  1. Товар [Код: 101" in str(receipt)
+
+        assert receipt[0].get_code() == 101
+        # Обращение по индексу не уплотняет список
+        assert receipt._holes == [0]
+        assert receipt.find_goods_by_code(105) is receipt[4]
+
+    def test_alternating_removal_and_indexing(self):
+        receipt = Receipt(12345, 100)
+        for i in range(100):
+            receipt.add_goods(Goods(f"{i},Товар{i},1.0,1"))
+
+        for i in range(0, 80, 2):
+            assert receipt.remove_goods(i)
+            assert receipt[0].get_code() == 1
+            assert receipt[-1 + len(receipt)].get_code() == 99
+            codes = [g.get_code() for g in receipt]
+            assert [receipt[k].get_code() for k in range(len(receipt))] == codes
+        # 40 удалений из 100 позиций - уплотнения ещё не было
+        assert len(receipt._holes) == 40
+
+        receipt[5] = Goods("500,Новый,2.0,1")
+        assert receipt[5].get_code() == 500
+        assert receipt.find_goods_by_code(500) is receipt[5]
+        assert receipt.remove_goods(11) is False
+        # 51-е удаление превышает половину позиций и уплотняет список
+        for code in range(80, 91):
+            receipt.remove_goods(code)
+        assert receipt._holes == []
+        assert [g.get_code() for g in receipt][:6] == [1, 3, 5, 7, 9, 500]
+        assert receipt.find_goods_by_code(99) is receipt[len(receipt) - 1]
+        assert receipt.get_total_sum() == len(receipt) + 1.0
+
+    def test_add_after_removals_reuses_slots(self):
+        receipt = Receipt(12345, 3)
+        for i in range(3):
+            receipt.add_goods(Goods(f"{i+100},Товар{i},1.0,1"))
+        receipt.remove_goods(100)
+
+        assert receipt.add_goods(Goods("200,Новый,1.0,1")) is True
+        assert receipt.add_goods(Goods("300,Лишний,1.0,1")) is False
+        assert [g.get_code() for g in receipt] == [101, 102, 200]
+
+    def test_remove_many(self):
+        receipt = Receipt(12345)
+        for i in range(6):
+            receipt.add_goods(Goods(f"{i+100},Товар{i},2.0,1"))
+        receipt.add_goods(Goods("101,Дубль,2.0,1"))
+
+        assert receipt.remove_many([101, 103, 101, 999]) == 3
+        assert receipt._holes == []
+        assert [g.get_code() for g in receipt] == [100, 102, 104, 105]
+        assert receipt[3].get_code() == 105
+        assert abs(receipt.get_total_sum() - 8.0) < 0.001
+
+    def test_buffer_grows_on_demand(self):
+        receipt = Receipt(12345, 10)
+        assert receipt.get_capacity() == 0
+
+        capacities = []
+        for i in range(10):
+            receipt.add_goods(Goods(f"{i+100},Товар{i},1.0,1"))
+            capacities.append(receipt.get_capacity())
+
+        assert capacities == [4, 4, 4, 4, 8, 8, 8, 8, 10, 10]
+        assert receipt.add_goods(Goods("200,Лишний,1.0,1")) is False
+        assert receipt.get_capacity() == 10
+
+    def test_capacity_stats(self):
+        receipts = [Receipt(i) for i in range(3)]
+        receipts[0].add_goods(Goods("100,Яблоки,2.5,10"))
+        for i in range(5):
+            receipts[1].add_goods(Goods(f"{i},Товар,1.0,1"))
+
+        stats = Receipt.capacity_stats(receipts)
+
+        assert stats["receipts"] == 3
+        assert stats["count"] == 6
+        assert stats["capacity"] == 4 + 8 + 0
+        assert stats["size"] == 3 * Receipt.MAX_SIZE
+        assert stats["buffer_bytes"] > 0
+
+    def test_merge(self):
+        receipt = Receipt(1, 3)
+        apples = Goods("100,Яблоки,2.5,10")
+        receipt.add_goods(apples)
+        receipt.add_goods(Goods("200,Бананы,1.8,15"))
+        other = Receipt(2)
+        bananas = Goods("200,Бананы,1.8,5")
+        other.add_goods(bananas)
+        other.add_goods(Goods("300,Груши,2.8,12"))
+        other.add_goods(Goods("400,Сливы,1.0,1"))
+
+        rejected = receipt.merge(other)
+
+        assert [g.get_code() for g in rejected] == [400]
+        assert receipt.find_goods_by_code(200).get_quantity() == 20
+        assert receipt.find_goods_by_code(300) is not other.find_goods_by_code(300)
+        assert bananas.get_quantity() == 5
+        assert abs(receipt.get_total_sum() - (25.0 + 36.0 + 33.6)) < 0.001
+
+    def test_merge_does_not_change_shared_lines(self):
+        shared = Goods("100,Яблоки,1.0,2")
+        receipt = Receipt(1)
+        other = Receipt(2)
+        receipt.add_goods(shared)
+        other.add_goods(shared)
+
+        receipt.merge(other)
+
+        assert shared.get_quantity() == 2
+        assert other.get_total_sum() == 2.0
+        assert receipt[0] is not shared
+        assert receipt[0].get_quantity() == 4
+        assert receipt.get_total_sum() == 4.0
+        # Замена строки снимает регистрацию чека у общего товара
+        shared.set_price(10.0)
+        assert receipt.get_total_sum() == 4.0
+        assert other.get_total_sum() == 20.0
+
+    def test_diff_and_reconcile(self):
+        till = Receipt(1)
+        server = Receipt(1)
+        for line in ("100,Яблоки,2.5,10", "200,Бананы,1.8,15", "300,Груши,2.8,12"):
+            till.add_goods(Goods(line))
+        for line in ("100,Яблоки,2.5,10", "200,Бананы,1.8,14", "400,Сливы,1.0,1"):
+            server.add_goods(Goods(line))
+
+        difference = till.diff(server)
+
+        assert [g.get_code() for g in difference.added] == [400]
+        assert [g.get_code() for g in difference.removed] == [300]
+        assert [
+            (a.get_quantity(), b.get_quantity()) for a, b in difference.changed
+        ] == [(15, 14)]
+        assert not till.diff(till)
+
+        only_server = Receipt(2)
+        only_server.add_goods(Goods("500,Дыни,4.0,1"))
+        same = Receipt(3)
+        result = Receipt.reconcile([till, same], [server, only_server, Receipt(3)])
+        assert sorted(result) == [1, 2]
+        assert [g.get_code() for g in result[2].added] == [500]
+
+
+class TestColumnarReceipt:
+    def test_matches_receipt(self):
+        receipt = Receipt(12345, 5)
+        columnar = ColumnarReceipt(12345, 5)
+        for line in ("100,Яблоки,2.5,10", "200,Бананы,1.8,15", "300,Яблоки,3.2,8"):
+            receipt.add_goods(Goods(line))
+            columnar.add_goods(Goods(line))
+
+        assert len(columnar) == 3
+        assert abs(columnar.get_total_sum() - receipt.get_total_sum()) < 0.001
+        assert columnar.get_total_quantity() == 33
+        assert str(columnar[1]) == str(receipt[1])
+        assert columnar._name_table == ["Яблоки", "Бананы"]
+
+    def test_capacity_update_remove(self):
+        columnar = ColumnarReceipt(1, 2)
+        assert columnar.add_goods(Goods("100,Яблоки,2.5,10")) is True
+        assert columnar.add_goods(Goods("200,Бананы,1.8,15")) is True
+        assert columnar.add_goods(Goods("300,Груши,3.2,8")) is False
+
+        assert columnar.update_goods(Goods("200,Бананы спелые,2.0,20")) is True
+        assert columnar.find_goods_by_code(200).get_name() == "Бананы спелые"
+        assert columnar.remove_goods(100) is True
+        assert columnar.remove_goods(100) is False
+        assert columnar.find_goods_by_code(100) is None
+        assert columnar[0].get_code() == 200
+        assert abs(columnar.get_total_sum() - 40.0) < 0.001
+
+        with pytest.raises(IndexError):
+            _ = columnar[1]
+
+    def test_add_columns(self):
+        columnar = ColumnarReceipt(1, 3)
+        columnar.add_goods(Goods("1,Хлеб,1.0,1"))
+
+        added = columnar.add_columns(
+            Goods.parse_batch("100,Яблоки,2.5,10\n200,Бананы,1.8,15\n300,Груши,2.8,12")
+        )
+
+        assert added == 2
+        assert [g.get_name() for g in columnar] == ["Хлеб", "Яблоки", "Бананы"]
+        assert abs(columnar.get_total_sum() - 53.0) < 0.001
+
+    def test_view_writes_through(self):
+        columnar = ColumnarReceipt(1)
+        columnar.add_goods(Goods("100,Яблоки,2.5,10"))
+
+        view = columnar[0]
+        view.set_quantity(4)
+        view.set_name("Груши")
+        assert columnar.get_total_quantity() == 4
+        assert abs(columnar.get_total_sum() - 10.0) < 0.001
+        assert columnar[0].get_name() == "Груши"
+
+    def test_view_cannot_join_receipt(self):
+        columnar = ColumnarReceipt(1)
+        columnar.add_goods(Goods("100,Яблоки,1.0,1"))
+        receipt = Receipt(2)
+        receipt.add_goods(Goods("100,Груши,3.0,1"))
+        view = columnar[0]
+
+        with pytest.raises(TypeError, match="копию"):
+            receipt.add_goods(view)
+        with pytest.raises(TypeError):
+            receipt.update_goods(view)
+        with pytest.raises(TypeError):
+            receipt[0] = view
+        assert [g.get_name() for g in receipt] == ["Груши"]
+        assert receipt.get_total_sum() == 3.0
+
+        assert receipt.add_goods(view.copy()) is True
+        view.set_quantity(10)
+        assert receipt.get_total_sum() == 4.0
+
+
+class TestConcurrentReceipt:
+    def test_parallel_writers_do_not_lose_lines(self):
+        receipt = ConcurrentReceipt(1, size=2000)
+
+        def writer(base):
+            for i in range(300):
+                assert receipt.add_goods(Goods(f"{base + i},Товар,1.0,2"))
+            for i in range(0, 300, 3):
+                assert receipt.remove_goods(base + i)
+            receipt.find_goods_by_code(base + 1).set_quantity(5)
+
+        threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        count, total, quantity = receipt.snapshot()
+        assert count == len(receipt) == 6 * 200
+        assert quantity == 6 * (199 * 2 + 5)
+        assert abs(total - quantity * 1.0) < 0.001
+        assert sorted(g.get_code() for g in receipt) == sorted(
+            n * 1000 + i for n in range(6) for i in range(300) if i % 3
+        )
+
+    def test_parallel_merges_do_not_duplicate_lines(self):
+        receipt = ConcurrentReceipt(1, size=1000)
+        source = Receipt(2, size=200)
+        for i in range(200):
+            source.add_goods(Goods(f"{i},Товар,1.0,1"))
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(target=receipt.merge, args=(source,)) for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        assert len(receipt) == 200
+        assert all(goods.get_quantity() == 8 for goods in receipt)
+        assert receipt.snapshot() == (200, 1600.0, 1600)
+
+    def test_merge_into_each_other(self):
+        first = ConcurrentReceipt(1)
+        second = ConcurrentReceipt(2)
+        first.add_goods(Goods("1,Товар,1.0,1"))
+        second.add_goods(Goods("2,Товар,1.0,1"))
+        threads = [
+            threading.Thread(target=first.merge, args=(second,)),
+            threading.Thread(target=second.merge, args=(first,)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert not any(thread.is_alive() for thread in threads)
+        assert {goods.get_code() for goods in first} == {1, 2}
+
+    def test_cross_merges_with_shared_lines_finish(self):
+        for _ in range(20):
+            first = ConcurrentReceipt(1, size=1000)
+            second = ConcurrentReceipt(2, size=1000)
+            for i in range(300):
+                shared = Goods(f"{i},Товар,1.0,1")
+                first.add_goods(shared)
+                second.add_goods(shared)
+            threads = [
+                threading.Thread(target=first.merge, args=(second,)),
+                threading.Thread(target=second.merge, args=(first,)),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+
+            assert not any(thread.is_alive() for thread in threads)
+            assert len(first) == len(second) == 300
+
+    def test_shared_goods_registered_in_every_receipt(self):
+        goods_list = [Goods(f"{i},Товар,1.0,1") for i in range(2000)]
+        receipts = [ConcurrentReceipt(n, size=2000) for n in range(4)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(
+                    target=lambda r=r: [r.add_goods(g) for g in goods_list]
+                )
+                for r in receipts
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+        for goods in goods_list:
+            goods.set_price(2.0)
+        assert [r.get_total_sum() for r in receipts] == [4000.0] * 4
+
+    def test_size_cap_under_contention(self):
+        receipt = ConcurrentReceipt(1, size=50)
+        results = []
+
+        def writer(base):
+            results.extend(
+                receipt.add_goods(Goods(f"{base + i},Товар,1.0,1")) for i in range(20)
+            )
+
+        threads = [threading.Thread(target=writer, args=(n * 100,)) for n in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) == 50
+        assert len(receipt) == 50
+
+
+class TestFixedPoint:
+    def test_to_minor_units(self):
+        assert to_minor_units("2.5") == 250
+        assert to_minor_units(2.675) == 268
+        assert to_minor_units(3) == 300
+        with pytest.raises(ValueError):
+            to_minor_units("рубль")
+
+    def test_fixed_point_goods(self):
+        goods = FixedPointGoods("100,Яблоки,0.1,3")
+
+        assert goods.get_price_cents() == 10
+        assert goods.get_price() == 0.1
+        assert goods.get_total_cents() == 30
+        assert goods.get_total() == 0.3
+        assert "Цена: 0.1, Количество: 3, Сумма: 0.3]" in str(goods)
+
+        goods.set_price(0.2)
+        assert goods.get_price_cents() == 20
+
+    def test_string_price_is_not_parsed_as_float(self):
+        goods = FixedPointGoods("1,A,12345678901234567.89,1")
+
+        assert goods.get_price_cents() == 1234567890123456789
+        with pytest.raises(ValueError):
+            FixedPointGoods("1,A,цена,1")
+
+    def test_from_lines_builds_fixed_point_lines(self):
+        (receipt,) = FixedPointReceipt.from_lines(["1,A,0.1,1", "2,B,0.2,1"])
+
+        assert all(type(goods) is FixedPointGoods for goods in receipt)
+        assert receipt.get_total_cents() == 30
+        assert all(
+            type(goods) is Goods for goods in next(Receipt.from_lines(["1,A,1,1"]))
+        )
+
+    def test_merge_keeps_fixed_point_lines(self):
+        receipt = FixedPointReceipt(1)
+        other = FixedPointReceipt(2)
+        other.add_goods(FixedPointGoods("100,Яблоки,0.1,3"))
+
+        receipt.merge(other)
+
+        assert type(receipt[0]) is FixedPointGoods
+        assert receipt[0] is not other[0]
+        assert receipt[0].get_price_cents() == 10
+        assert receipt.get_total_cents() == 30
+
+    def test_receipt_total_is_exact(self):
+        receipt = FixedPointReceipt(1, size=1000)
+        float_receipt = Receipt(1, size=1000)
+        for i in range(1000):
+            receipt.add_goods(FixedPointGoods(f"{i},Товар,0.1,1"))
+            float_receipt.add_goods(Goods(f"{i},Товар,0.1,1"))
+
+        assert receipt.get_total_cents() == 10000
+        assert receipt.get_total_sum() == 100.0
+        # Вещественный чек даёт точную сумму двоичных значений 0.1 и 0.2
+        pair = FixedPointReceipt(2)
+        float_pair = Receipt(2)
+        for line in ("1,Товар,0.1,1", "2,Товар,0.2,1"):
+            pair.add_goods(FixedPointGoods(line))
+            float_pair.add_goods(Goods(line))
+        assert pair.get_total_sum() == 0.3
+        assert float_pair.get_total_sum() != 0.3
+
+        receipt[0].set_quantity(11)
+        receipt[1].set_price(1.1)
+        receipt.remove_goods(2)
+        receipt.add_goods(Goods("5000,Обычный,2.675,2"))
+        assert receipt.get_total_cents() == 10000 + 100 + 100 - 10 + 536
+        assert (
+            FixedPointReceipt.sum_cents([receipt, FixedPointReceipt(2)])
+            == receipt.get_total_cents()
+        )
+
+
+class TestCatalog:
+    def make_catalog(self):
+        return Catalog.from_goods(
+            [Goods("100,Яблоки,2.5,0"), Goods("200,Бананы,1.8,0")]
+        )
+
+    def test_lines_resolve_from_catalog(self):
+        catalog = self.make_catalog()
+        line = catalog.line(100, 4)
+
+        assert len(catalog) == 2 and 100 in catalog
+        assert line.get_name() == "Яблоки"
+        assert line.get_price() == 2.5
+        assert line.get_total() == 10.0
+        assert str(line) == str(Goods("100,Яблоки,2.5,4"))
+        with pytest.raises(KeyError):
+            catalog.line(999, 1)
+        with pytest.raises(TypeError):
+            line.set_name("Груши")
+
+    def test_catalog_repricing_updates_receipt_totals(self):
+        catalog = self.make_catalog()
+        receipt1 = Receipt(1)
+        receipt2 = FixedPointReceipt(2)
+        receipt1.add_goods(catalog.line(100, 2))
+        receipt1.add_goods(catalog.line(200, 1, price=1.0))
+        receipt2.add_goods(catalog.line(100, 3))
+        loose = catalog.line(100, 10)
+
+        catalog.set_price(100, 3.0)
+        catalog.set_price(200, 5.0)
+
+        assert loose.get_total() == 30.0
+        assert abs(receipt1.get_total_sum() - (6.0 + 1.0)) < 0.001
+        assert receipt2.get_total_cents() == 900
+
+        receipt1[1].reset_price()
+        assert abs(receipt1.get_total_sum() - 11.0) < 0.001
+
+        receipt1[0].set_code(200)
+        assert abs(receipt1.get_total_sum() - 15.0) < 0.001
+        assert receipt1.find_goods_by_code(200) is receipt1[0]
+
+        receipt1.remove_goods(200)
+        receipt1.remove_goods(200)
+        catalog.set_price(200, 7.0)
+        assert receipt1.get_total_sum() == 0.0
+        assert 200 not in catalog._receipts
+
+    def test_merge_keeps_catalog_lines(self):
+        catalog = self.make_catalog()
+        receipt = Receipt(1)
+        other = Receipt(2)
+        receipt.add_goods(catalog.line(100, 2))
+        other.add_goods(catalog.line(100, 3))
+
+        receipt.merge(other)
+        catalog.set_price(100, 3.0)
+
+        assert receipt[0].get_quantity() == 5
+        assert receipt.get_total_sum() == 15.0
+        assert other.get_total_sum() == 9.0
+
+    def test_catalog_does_not_keep_receipts_alive(self):
+        catalog = self.make_catalog()
+        receipt = Receipt(1)
+        receipt.add_goods(catalog.line(100, 2))
+        receipt.add_goods(catalog.line(100, 3, price=1.0))
+        kept = Receipt(2)
+        kept.add_goods(catalog.line(100, 1))
+        dropped = weakref.ref(receipt)
+
+        del receipt
+        gc.collect()
+        catalog.set_price(100, 4.0)
+
+        assert dropped() is None
+        assert [ref() for ref in catalog._receipts[100]] == [kept]
+        assert kept.get_total_sum() == 4.0
+
+    def test_repricing_visits_only_receipts_with_code(self):
+        catalog = self.make_catalog()
+        visited = []
+
+        class SpyReceipt(Receipt):
+            def _goods_with_code(self, code):
+                visited.append(self.get_receipt_number())
+                return super()._goods_with_code(code)
+
+        apples = SpyReceipt(1)
+        apples.add_goods(catalog.line(100, 2))
+        bananas = SpyReceipt(2)
+        bananas.add_goods(catalog.line(200, 1))
+        moved = SpyReceipt(3)
+        moved.add_goods(catalog.line(200, 1))
+        moved[0].set_code(100)
+
+        catalog.set_price(100, 3.0)
+        assert sorted(visited) == [1, 3]
+        assert moved.get_total_sum() == 3.0
+
+        visited.clear()
+        catalog.set_price(200, 2.0)
+        assert visited == [2]
+        assert [ref() for ref in catalog._receipts[200]] == [bananas]
+
+    def test_registry_drops_dropped_receipts(self):
+        catalog = self.make_catalog()
+        for number in range(3000):
+            receipt = Receipt(number)
+            receipt.add_goods(catalog.line(100 if number % 2 else 200, 1))
+            del receipt
+
+        assert catalog._registered < 2 * _SWEEP_MIN
+        assert sum(map(len, catalog._receipts.values())) == catalog._registered
+
+    def test_readded_code_is_repriced_once(self):
+        catalog = self.make_catalog()
+        receipt = Receipt(1)
+        receipt.add_goods(catalog.line(100, 2))
+        receipt.add_goods(catalog.line(100, 1))
+        receipt.remove_goods(100)
+        receipt.remove_goods(100)
+        receipt.add_goods(catalog.line(100, 3))
+
+        catalog.set_price(100, 4.0)
+
+        assert receipt.get_total_sum() == 12.0
+        assert len(catalog._receipts[100]) == 1
+
+    def test_lines_have_no_name_and_price_slots(self):
+        line = Catalog.from_goods([Goods("100,Яблоки,2.5,0")]).line(100, 1)
+
+        assert not isinstance(line, Goods)
+        # Ссылка на каталог и собственная цена вместо наименования и цены
+        assert "_name" not in CatalogGoods.__slots__
+        assert "_price" not in CatalogGoods.__slots__
+        assert not hasattr(line, "__dict__")
+        catalog = Catalog()
+        catalog.add_product(10**6, "Дыни", 4.0)
+        first = catalog.line(int("1000000"), 1)
+        assert first.get_code() is catalog.line(int("1000000"), 2).get_code()
+        line.set_price(3.0)
+        assert line.get_price_override() == 3.0
+
+
+class TestSortedReceipt:
+    def make_receipt(self, number=1):
+        receipt = SortedReceipt(number)
+        for line in (
+            "100,Яблоки,2.5,10",
+            "200,Бананы,1.8,15",
+            "300,Груши,3.2,8",
+            "400,Сливы,0.5,100",
+        ):
+            receipt.add_goods(Goods(line))
+        return receipt
+
+    def codes(self, goods_list):
+        return [goods.get_code() for goods in goods_list]
+
+    def test_queries(self):
+        receipt = self.make_receipt()
+
+        assert self.codes(receipt.most_expensive(2)) == [300, 100]
+        assert self.codes(receipt.top_by_total(2)) == [400, 200]
+        assert self.codes(receipt.price_range(1.8, 2.5)) == [200, 100]
+        assert receipt.price_range(5.0, 10.0) == []
+        assert receipt.most_expensive(0) == []
+
+    def test_indexes_follow_mutations(self):
+        receipt = self.make_receipt()
+        receipt.remove_goods(400)
+        receipt[0] = Goods("500,Дыни,4.0,1")
+        receipt.update_goods(Goods("300,Груши,1.0,1"))
+        receipt.find_goods_by_code(200).set_price(9.0)
+        shared = Goods("600,Киви,2.0,3")
+        receipt.add_goods(shared)
+        receipt.add_goods(shared)
+        shared.set_quantity(50)
+
+        assert self.codes(receipt.most_expensive(10)) == [200, 500, 600, 600, 300]
+        assert self.codes(receipt.top_by_total(3)) == [200, 600, 600]
+        assert len(receipt._by_total) == len(receipt)
+        receipt.remove_goods(600)
+        assert self.codes(receipt.price_range(2.0, 2.0)) == [600]
+
+    def test_top_across(self):
+        receipt1 = self.make_receipt(1)
+        receipt2 = SortedReceipt(2)
+        receipt2.add_goods(Goods("700,Арбуз,10.0,6"))
+
+        top = SortedReceipt.top_across([receipt1, receipt2], 3)
+
+        assert [(number, goods.get_code()) for number, goods in top] == [
+            (2, 700),
+            (1, 400),
+            (1, 200),
+        ]
+        assert [
+            n for n, _ in SortedReceipt.top_across([receipt1, receipt2], 2, by="price")
+        ] == [2, 1]
+        with pytest.raises(ValueError):
+            SortedReceipt.top_across([receipt1], 1, by="name")
+
+
+class TestReceiptMetrics:
+    def test_counters_and_timings(self):
+        metrics = ReceiptMetrics()
+        events = []
+        metrics.add_callback(lambda event, receipt, value: events.append(event))
+        receipt = Receipt(1, 4)
+        receipt.set_metrics(metrics)
+        for code in (100, 200, 300, 400, 500):
+            receipt.add_goods(Goods(f"{code},Товар,1.0,1"))
+        receipt.find_goods_by_code(200)
+        receipt.find_goods_by_code(999)
+        receipt.remove_goods(100)
+        receipt.remove_goods(200)
+        receipt.remove_goods(300)
+
+        assert metrics.get_counter("add_goods") == 4
+        assert metrics.get_counter("size_cap_hits") == 1
+        assert metrics.get_counter("remove_goods") == 3
+        assert metrics.get_counter("compactions") == 1
+        assert metrics.get_counter("shifted_lines") == 1
+        exported = metrics.export()
+        lookups = exported["timings"]["find_goods_by_code"]
+        assert lookups["count"] == lookups["buckets"]["+Inf"] == 2
+        assert exported["counters"]["size_cap_hits"] == 1
+        assert events.count("find_goods_by_code") == 2
+        assert "size_cap_hits" in events
+
+    def test_default_and_per_receipt(self):
+        metrics = ReceiptMetrics()
+        Receipt.set_default_metrics(metrics)
+        try:
+            enabled = SortedReceipt(1)
+            disabled = Receipt(2)
+            disabled.set_metrics(None)
+            enabled.add_goods(Goods("100,Товар,1.0,1"))
+            disabled.add_goods(Goods("100,Товар,1.0,1"))
+        finally:
+            Receipt.set_default_metrics(None)
+
+        assert metrics.get_counter("add_goods") == 1
+        assert Receipt(3).get_metrics() is None
+        metrics.reset()
+        assert metrics.export() == {"counters": {}, "timings": {}}
+
+
+class TestReceiptRenderer:
+    def test_matches_str(self):
+        receipt = Receipt(12345)
+        receipt.add_goods(Goods("100,Яблоки,2.5,10"))
+        receipt.add_goods(Goods("200,Бананы,1.8,15"))
+        receipt.add_goods(Goods("300,Груши,2.8,12"))
+        receipt.remove_goods(200)
+        stream = StringIO()
+
+        ReceiptRenderer(stream, buffer_lines=2).render_many([receipt])
+
+        assert stream.getvalue() == str(receipt) + "\n\n"
+
+    def test_render_many_columnar_and_empty(self):
+        columnar = ColumnarReceipt(1)
+        columnar.add_goods(Goods("100,Яблоки,2.5,10"))
+        empty = Receipt(2)
+        stream = StringIO()
+
+        renderer = ReceiptRenderer(stream, separator="")
+        assert renderer.render_many([columnar, empty]) == 2
+
+        assert stream.getvalue() == str(columnar) + "\n" + str(empty) + "\n"
+
+
+class TestReceiptArchive:
+    def make_receipts(self):
+        receipts = []
+        for number in range(3):
+            receipt = Receipt(1000 + number, 10)
+            receipt.add_goods(Goods(f"{number},Яблоки,2.5,{number + 1}"))
+            receipt.add_goods(Goods("200,Бананы,1.8,15"))
+            receipt.add_goods(Goods("300,Яблоки,3.2,8"))
+            receipts.append(receipt)
+        return receipts
+
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "receipts.bin"
+        receipts = self.make_receipts()
+        append_receipts(path, receipts[:2])
+        append_receipts(path, receipts[2:])
+
+        with ReceiptArchive(path) as archive:
+            assert len(archive) == 3
+            archived = archive.get(1001)
+            assert archived is not None
+            assert archived.get_date_time() == receipts[1].get_date_time()
+            assert len(archived) == 3
+            assert list(archived.iter_lines())[0] == (1, 2.5, 2)
+            assert list(archived.iter_named_lines()) == [
+                (1, "Яблоки", 2.5, 2),
+                (200, "Бананы", 1.8, 15),
+                (300, "Яблоки", 3.2, 8),
+            ]
+            assert str(archived.to_receipt()) == str(receipts[1])
+            assert abs(archived.get_total_sum() - receipts[1].get_total_sum()) < 0.001
+            assert archived[2].get_name() == "Яблоки"
+            assert archive.get(999) is None
+            assert [r.get_receipt_number() for r in archive] == [1000, 1001, 1002]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"NOPE\x01\x00\x00\x00")
+
+        with pytest.raises(ValueError):
+            ReceiptArchive(path)
+
+    def test_rejects_broken_records(self, tmp_path):
+        path = tmp_path / "receipts.bin"
+        append_receipts(path, self.make_receipts()[:2])
+        data = path.read_bytes()
+
+        truncated = tmp_path / "truncated.bin"
+        truncated.write_bytes(data[:-40])
+        with ReceiptArchive(truncated) as archive:
+            with pytest.raises(ValueError, match="длина записи"):
+                len(archive)
+
+        zero_length = tmp_path / "zero.bin"
+        zero_length.write_bytes(data[:8] + bytes(4) + data[12:])
+        with ReceiptArchive(zero_length) as archive:
+            with pytest.raises(ValueError, match="длина записи"):
+                list(archive)
+
+        short_header = tmp_path / "short.bin"
+        short_header.write_bytes(data + bytes(6))
+        with ReceiptArchive(short_header) as archive:
+            with pytest.raises(ValueError, match="Обрезанная запись"):
+                archive.get(1000)
+
+
+class TestReceiptStore:
+    def make_receipt(self, number, start, minutes, codes):
+        receipt = Receipt(number)
+        receipt._date_time = start + timedelta(minutes=minutes)
+        for code in codes:
+            receipt.add_goods(Goods(f"{code},Товар{code},1.0,1"))
+        return receipt
+
+    def test_indexes_and_reopen(self, tmp_path):
+        path = tmp_path / "store.bin"
+        start = datetime(2024, 5, 1, 9, 0)
+        with ReceiptStore(path) as store:
+            store.extend(
+                [
+                    self.make_receipt(1, start, 30, [100, 200]),
+                    self.make_receipt(2, start, 10, [200]),
+                    self.make_receipt(3, start, 50, [100, 300]),
+                ]
+            )
+            assert len(store) == 3
+            assert store.get(3).get_date_time() == start + timedelta(minutes=50)
+            assert [r.get_receipt_number() for r in store.between()] == [2, 1, 3]
+
+        with ReceiptStore(path) as store:
+            assert len(store) == 3
+            store.append(self.make_receipt(4, start, 40, [100]))
+
+            window = store.with_code(
+                100, start + timedelta(minutes=30), start + timedelta(minutes=50)
+            )
+            assert [r.get_receipt_number() for r in window] == [1, 4]
+            assert [
+                r.get_receipt_number()
+                for r in store.with_code(200, start + timedelta(minutes=20))
+            ] == [1]
+            assert list(store.with_code(999)) == []
+            assert store.get(5) is None
+
+    def test_reopen_after_torn_append(self, tmp_path):
+        path = tmp_path / "store.bin"
+        start = datetime(2024, 5, 1, 9, 0)
+        with ReceiptStore(path) as store:
+            store.append(self.make_receipt(1, start, 0, [100, 200]))
+            store.append(self.make_receipt(2, start, 10, [200, 300]))
+        path.write_bytes(path.read_bytes()[:-40])
+
+        with ReceiptStore(path) as store:
+            assert len(store) == 1
+            assert store.get(2) is None
+            store.append(self.make_receipt(3, start, 20, [300]))
+
+        with ReceiptStore(path) as store:
+            assert [r.get_receipt_number() for r in store.between()] == [1, 3]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"NOPE\x01\x00\x00\x00")
+
+        with pytest.raises(ValueError):
+            ReceiptStore(path)
+        assert path.read_bytes() == b"NOPE\x01\x00\x00\x00"
+
+
+class TestAggregateSales:
+    def make_receipts(self):
+        receipts = []
+        for number in range(40):
+            receipt = Receipt(number)
+            receipt._date_time = datetime(2024, 5, 1, 8 + number % 5, 15)
+            for i in range(7):
+                code = (number * 7 + i) % 11
+                receipt.add_goods(
+                    Goods(f"{code},Товар{code % 3},{0.1 * (i + 1)},{number % 4 + 1}")
+                )
+            receipts.append(receipt)
+        return receipts
+
+    def test_serial_totals(self):
+        receipts = self.make_receipts()
+
+        by_code = aggregate_sales(receipts)
+
+        expected_units = sum(
+            g.get_quantity() for r in receipts for g in r if g.get_code() == 3
+        )
+        assert by_code[3].units == expected_units
+        assert sum(t.lines for t in by_code.values()) == 280
+        by_hour = aggregate_sales(receipts, group_by="hour")
+        assert sorted(by_hour) == [8, 9, 10, 11, 12]
+
+    def test_parallel_matches_serial_exactly(self):
+        receipts = self.make_receipts()
+
+        for group_by in ("code", "name", "hour"):
+            serial = aggregate_sales(receipts, group_by=group_by)
+            parallel = aggregate_sales(
+                receipts, group_by=group_by, workers=2, chunk_size=17
+            )
+            assert parallel == serial
+
+    def test_parallel_over_archived_receipts(self, tmp_path):
+        receipts = self.make_receipts()
+        path = tmp_path / "receipts.bin"
+        append_receipts(path, receipts)
+
+        with ReceiptArchive(path) as archive:
+            for group_by in ("code", "name", "hour"):
+                expected = aggregate_sales(receipts, group_by=group_by)
+                parallel = aggregate_sales(
+                    archive, group_by=group_by, workers=2, chunk_size=50
+                )
+                assert parallel == expected
+                assert aggregate_sales(archive, group_by=group_by) == expected
+
+    def test_unknown_group(self):
+        with pytest.raises(ValueError):
+            aggregate_sales([], group_by="price")
+
+
+class TestReceiptIngestor:
+    def test_many_producers_and_rejections(self):
+        async def producer(number, count):
+            for i in range(count):
+                yield number, f"{i},Товар{i},1.5,2"
+                await asyncio.sleep(0)
+            yield number, "плохая строка"
+
+        rejections: list[IngestRejection] = []
+        ingestor = ReceiptIngestor(
+            receipt_size=5, queue_size=3, on_reject=rejections.append
+        )
+
+        receipts = asyncio.run(
+            ingestor.run([producer(1, 4), producer(2, 7), producer(3, 0)])
+        )
+
+        assert len(receipts[1]) == 4
+        assert len(receipts[2]) == 5
+        assert 3 not in receipts
+        assert abs(receipts[2].get_total_sum() - 15.0) < 0.001
+        reasons = sorted(
+            (r.receipt_number, r.reason.startswith("Достигнут")) for r in rejections
+        )
+        assert reasons == [(1, False), (2, False), (2, True), (2, True), (3, False)]
+
+    def test_bounded_queue_applies_backpressure(self):
+        ingestor = ReceiptIngestor(queue_size=2)
+        lag = []
+
+        async def producer():
+            for i in range(50):
+                yield 1, f"{i},Товар,1.0,1"
+                accepted = ingestor.get_receipts().get(1)
+                lag.append(i + 1 - (len(accepted) if accepted else 0))
+
+        asyncio.run(ingestor.run([producer()]))
+
+        assert len(ingestor.get_receipts()[1]) == 50
+        assert max(lag) <= 2 + 1
+
+    def test_failing_producer_cancels_blocked_producers(self):
+        ingestor = ReceiptIngestor(queue_size=1)
+
+        async def endless():
+            i = 0
+            while True:
+                yield 1, f"{i},Товар,1.0,1"
+                i += 1
+
+        async def failing():
+            yield 2, "1,Товар,1.0,1"
+            raise RuntimeError("источник недоступен")
+
+        async def main():
+            with pytest.raises(ExceptionGroup) as excinfo:
+                await ingestor.run([endless(), failing()])
+            assert excinfo.group_contains(RuntimeError, depth=2)
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert asyncio.run(main()) == set()
+
+    def test_failing_consumer_cancels_producers(self):
+        def on_reject(rejection):
+            raise RuntimeError(rejection.reason)
+
+        ingestor = ReceiptIngestor(queue_size=1, on_reject=on_reject)
+
+        async def producer():
+            yield 1, "плохая строка"
+            for i in range(100):
+                yield 1, f"{i},Товар,1.0,1"
+
+        async def main():
+            with pytest.raises(ExceptionGroup) as excinfo:
+                await ingestor.run([producer()])
+            assert excinfo.group_contains(RuntimeError)
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert asyncio.run(main()) == set()
+
 
 class TestReceiptIntegration:
     def test_complete_workflow(self):
@@ -329,6 +1512,17 @@ class TestEdgeCases:
         assert receipt[0].get_code() == 100
         assert receipt[1].get_code() == 100
 
+    def test_duplicate_codes_find_and_remove_first(self):
+        receipt = Receipt(12345)
+        goods1 = Goods("100,Яблоки,2.5,10")
+        goods2 = Goods("100,Бананы,1.8,15")
+        receipt.add_goods(goods1)
+        receipt.add_goods(goods2)
+
+        assert receipt.find_goods_by_code(100) is goods1
+        assert receipt.remove_goods(100) is True
+        assert receipt.find_goods_by_code(100) is goods2
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])